@@ -3,45 +3,456 @@
 # Matricula: AL07193847
 # Fecha de entrega: Lunes 25 de Agosto
 
-print("Bienvenido al sistema de entradas del Museo de Arte e Historia de Guanajuato\n")
+import argparse
+import os
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
 
-total_pagar = 0
-contador_visitantes = 0
+try:
+    import numpy as np
+except ImportError:  # NumPy solo es necesario para cobrar lotes vectorizados
+    np = None
 
-while True:
-    try:
-        edad = int(input("Ingrese la edad del visitante: "))
-    except ValueError:
-        print("Por favor, ingrese un número válido para la edad.\n")
-        continue
-
-    if edad < 3:
-        print("El visitante entra gratis por ser menor de 3 años.\n")
-        continue  # No se contabiliza ni se cobra
-
-    # Precio base por edad
-    precio = 30 if edad < 18 else 45
-
-    # Descuento
-    if edad >= 60:
-        descuento = 0.12
-        print("Descuento aplicado: Adulto mayor (12%)")
+# =====================================
+# Reglas de precio
+# =====================================
+EDAD_GRATIS = 3          # Menores de esta edad entran gratis
+EDAD_ADULTO = 18         # Desde esta edad se cobra precio de adulto
+EDAD_ADULTO_MAYOR = 60   # Desde esta edad aplica el descuento de adulto mayor
+
+PRECIO_MENOR = 30
+PRECIO_ADULTO = 45
+
+DESCUENTO_ADULTO_MAYOR = 0.12
+DESCUENTO_ESTUDIANTE = 0.10   # Estudiante o profesor
+
+# Las mismas reglas como diccionario, para poder configurarlas (ver TablaTarifas)
+REGLAS_PREDETERMINADAS = {
+    "edad_gratis": EDAD_GRATIS,
+    "edad_adulto": EDAD_ADULTO,
+    "edad_adulto_mayor": EDAD_ADULTO_MAYOR,
+    "precio_menor": PRECIO_MENOR,
+    "precio_adulto": PRECIO_ADULTO,
+    "descuento_adulto_mayor": DESCUENTO_ADULTO_MAYOR,
+    "descuento_estudiante": DESCUENTO_ESTUDIANTE,
+}
+
+# Categorías de descuento que se preguntan en taquilla
+CATEGORIA_GENERAL = 0
+CATEGORIA_ESTUDIANTE = 1   # Estudiante o profesor
+
+# Rangos de edad y tipos de descuento que se guardan en la bitácora (por posición)
+BANDAS_EDAD = ("gratis", "menor", "adulto", "adulto_mayor")
+TIPOS_DESCUENTO = ("ninguno", "estudiante", "adulto_mayor")
+
+
+# =====================================
+# Motor de precios (lo usan todas las taquillas)
+# =====================================
+def calcular_descuento(edad, es_estudiante=False, reglas=REGLAS_PREDETERMINADAS):
+    # El adulto mayor tiene su propio descuento; no se acumula con el de estudiante
+    if edad >= reglas["edad_adulto_mayor"]:
+        return reglas["descuento_adulto_mayor"]
+    return reglas["descuento_estudiante"] if es_estudiante else 0.0
+
+
+def calcular_pago(edad, es_estudiante=False, reglas=REGLAS_PREDETERMINADAS):
+    # Pago de un visitante (0 si entra gratis)
+    if edad < reglas["edad_gratis"]:
+        return 0.0
+    precio = reglas["precio_menor"] if edad < reglas["edad_adulto"] else reglas["precio_adulto"]
+    return precio * (1 - calcular_descuento(edad, es_estudiante, reglas))
+
+
+def calcular_pagos(edades, estudiantes=None, reglas=REGLAS_PREDETERMINADAS):
+    # Pagos de un lote de visitantes en una sola llamada.
+    # edades: lista o arreglo de edades; estudiantes: lista o arreglo de
+    # verdadero/falso (None = nadie es estudiante ni profesor); reglas: las
+    # de TablaTarifas.reglas si se configuraron otros precios.
+    # Con NumPy se calcula todo el lote con operaciones de arreglos y se
+    # regresa un arreglo; sin NumPy, una lista.
+    if np is None:
+        if estudiantes is None:
+            estudiantes = [False] * len(edades)
+        return [calcular_pago(edad, estudiante, reglas) for edad, estudiante in zip(edades, estudiantes)]
+
+    edades = np.asarray(edades)
+    if estudiantes is None:
+        estudiantes = np.zeros(len(edades), dtype=bool)
     else:
-        respuesta = input("¿Es estudiante o profesor? (s/n): ").lower()
-        descuento = 0.10 if respuesta == 's' else 0.0
-        if descuento > 0:
-            print("Descuento aplicado: Estudiante o Profesor (10%)")
+        estudiantes = np.asarray(estudiantes, dtype=bool)
+
+    precio = np.where(edades < reglas["edad_adulto"], reglas["precio_menor"], reglas["precio_adulto"])
+    descuento = np.where(edades >= reglas["edad_adulto_mayor"], reglas["descuento_adulto_mayor"],
+                         np.where(estudiantes, reglas["descuento_estudiante"], 0.0))
+    return np.where(edades < reglas["edad_gratis"], 0.0, precio * (1 - descuento))
+
+
+def cobrar_lote(edades, estudiantes=None, reglas=REGLAS_PREDETERMINADAS):
+    # Regresa (total a pagar, visitantes cobrados) de un lote.
+    # Igual que en la taquilla, los que entran gratis no se contabilizan.
+    pagos = calcular_pagos(edades, estudiantes, reglas)
+    if np is None:
+        visitantes = sum(1 for edad in edades if edad >= reglas["edad_gratis"])
+        return sum(pagos), visitantes
+    visitantes = int(np.count_nonzero(np.asarray(edades) >= reglas["edad_gratis"]))
+    return float(pagos.sum()), visitantes
+
+
+# =====================================
+# Tabla de tarifas precalculada
+# =====================================
+class TablaTarifas:
+    # Precio de cada (edad, categoría) calculado una sola vez con las reglas
+    # vigentes, para que cobrar en el torniquete sea solo una consulta.
+    # Al cambiar una regla con configurar() la tabla se vuelve a construir.
+
+    EDAD_MAXIMA = 130   # Edades mayores usan el precio de esta edad
+
+    def __init__(self, **reglas):
+        self.reglas = dict(REGLAS_PREDETERMINADAS)
+        self.configurar(**reglas)
+
+    def configurar(self, **reglas):
+        # Cambia una o varias reglas (ej. precio_adulto=50) y reconstruye la tabla
+        for nombre in reglas:
+            if nombre not in REGLAS_PREDETERMINADAS:
+                raise ValueError(f"Regla desconocida: {nombre}")
+        self.reglas.update(reglas)
+        self._construir()
+
+    def _construir(self):
+        # Lista plana: posición = edad * 2 + categoría
+        self._tabla = [calcular_pago(edad, categoria == CATEGORIA_ESTUDIANTE, self.reglas)
+                       for edad in range(self.EDAD_MAXIMA + 1)
+                       for categoria in (CATEGORIA_GENERAL, CATEGORIA_ESTUDIANTE)]
+        # Con NumPy, además, una matriz (edad, categoría) para cobrar lotes
+        self._arreglo = None if np is None else np.array(self._tabla).reshape(-1, 2)
+
+    def precio(self, edad, es_estudiante=False):
+        # Precio de un visitante (las edades negativas se tratan como 0)
+        edad = min(max(edad, 0), self.EDAD_MAXIMA)
+        return self._tabla[edad * 2 + (CATEGORIA_ESTUDIANTE if es_estudiante else CATEGORIA_GENERAL)]
+
+    def precios(self, edades, estudiantes=None):
+        # Precios de un lote; con NumPy es una sola consulta indexada
+        if self._arreglo is None:
+            if estudiantes is None:
+                estudiantes = [False] * len(edades)
+            return [self.precio(edad, estudiante) for edad, estudiante in zip(edades, estudiantes)]
+        edades = np.clip(np.asarray(edades), 0, self.EDAD_MAXIMA)
+        if estudiantes is None:
+            return self._arreglo[edades, CATEGORIA_GENERAL]
+        return self._arreglo[edades, np.asarray(estudiantes, dtype=np.intp)]
+
+
+def clasificar(edad, es_estudiante=False, reglas=REGLAS_PREDETERMINADAS):
+    # Regresa (rango de edad, tipo de descuento) como posiciones de
+    # BANDAS_EDAD y TIPOS_DESCUENTO
+    if edad < reglas["edad_gratis"]:
+        return 0, 0
+    if edad >= reglas["edad_adulto_mayor"]:
+        return 3, 2
+    banda = 1 if edad < reglas["edad_adulto"] else 2
+    return banda, (1 if es_estudiante else 0)
+
+
+# =====================================
+# Bitácora de ventas (solo se agrega)
+# =====================================
+class BitacoraVentas:
+    # Archivo binario con un registro de 6 bytes por visitante: rango de
+    # edad, tipo de descuento y pago en centavos. Los registros se juntan en
+    # memoria y se escriben por bloques; cada `intervalo_fsync` segundos se
+    # fuerza la escritura a disco (os.fsync) para no perder el día si el
+    # programa se cae.
+
+    REGISTRO = struct.Struct("<BBI")   # banda, descuento, centavos
+
+    def __init__(self, ruta, registros_por_bloque=4096, intervalo_fsync=1.0):
+        self.ruta = ruta
+        self.registros_por_bloque = registros_por_bloque
+        self.intervalo_fsync = intervalo_fsync
+        self._archivo = open(ruta, "ab")
+        self._bufer = bytearray()
+        self._ultimo_fsync = time.monotonic()
+
+    def registrar(self, banda, descuento, centavos):
+        self._bufer += self.REGISTRO.pack(banda, descuento, centavos)
+        if len(self._bufer) >= self.registros_por_bloque * self.REGISTRO.size:
+            self.vaciar()
+
+    def registrar_lote(self, bandas, descuentos, centavos):
+        # Con NumPy los registros del lote se empaquetan en un solo arreglo
+        if np is None:
+            for registro in zip(bandas, descuentos, centavos):
+                self.registrar(*registro)
+            return
+        registros = np.empty(len(bandas), dtype=[("banda", "u1"), ("descuento", "u1"),
+                                                 ("centavos", "<u4")])
+        registros["banda"] = bandas
+        registros["descuento"] = descuentos
+        registros["centavos"] = centavos
+        self._bufer += registros.tobytes()
+        if len(self._bufer) >= self.registros_por_bloque * self.REGISTRO.size:
+            self.vaciar()
+
+    def vaciar(self, forzar_fsync=False):
+        # Escribe lo pendiente y, si ya pasó el intervalo, lo fuerza a disco
+        if self._bufer:
+            self._archivo.write(self._bufer)
+            self._bufer.clear()
+        self._archivo.flush()
+        if forzar_fsync or time.monotonic() - self._ultimo_fsync >= self.intervalo_fsync:
+            os.fsync(self._archivo.fileno())
+            self._ultimo_fsync = time.monotonic()
+
+    def cerrar(self):
+        self.vaciar(forzar_fsync=True)
+        self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
 
-    pago = precio * (1 - descuento)
-    total_pagar += pago
-    contador_visitantes += 1
+def reporte_del_dia(ruta, registros_por_bloque=65536):
+    # Lee la bitácora por bloques (memoria constante) y regresa visitantes
+    # y centavos por rango de edad y por tipo de descuento. Un registro
+    # incompleto al final (programa interrumpido a media escritura) se ignora.
+    tamano = BitacoraVentas.REGISTRO.size
+    por_banda = {banda: [0, 0] for banda in BANDAS_EDAD}
+    por_descuento = {tipo: [0, 0] for tipo in TIPOS_DESCUENTO}
+    with open(ruta, "rb") as archivo:
+        while True:
+            bloque = archivo.read(registros_por_bloque * tamano)
+            if not bloque:
+                break
+            completo = len(bloque) - len(bloque) % tamano
+            for banda, descuento, centavos in BitacoraVentas.REGISTRO.iter_unpack(bloque[:completo]):
+                acumulado = por_banda[BANDAS_EDAD[banda]]
+                acumulado[0] += 1
+                acumulado[1] += centavos
+                acumulado = por_descuento[TIPOS_DESCUENTO[descuento]]
+                acumulado[0] += 1
+                acumulado[1] += centavos
+    return {"por_banda": por_banda, "por_descuento": por_descuento}
+
+
+def mostrar_reporte(reporte):
+    lineas = ["\nReporte del día", "Por rango de edad:"]
+    for banda, (visitantes, centavos) in reporte["por_banda"].items():
+        lineas.append(f"  {banda:<14}{visitantes:>10,} visitantes  ${centavos / 100:>14,.2f}")
+    lineas.append("Por tipo de descuento:")
+    for tipo, (visitantes, centavos) in reporte["por_descuento"].items():
+        lineas.append(f"  {tipo:<14}{visitantes:>10,} visitantes  ${centavos / 100:>14,.2f}")
+    total = sum(centavos for _, centavos in reporte["por_banda"].values())
+    lineas.append(f"Total del día: ${total / 100:,.2f}")
+    print("\n".join(lineas))
+
+
+# =====================================
+# Ventas de varias taquillas
+# =====================================
+class ResumenVentas(NamedTuple):
+    # Totales de una taquilla o de todo el día
+    visitantes: int = 0        # Visitantes cobrados
+    gratis: int = 0            # Menores de 3 años (no se cobran)
+    adultos_mayores: int = 0   # Cobrados con descuento de adulto mayor
+    estudiantes: int = 0       # Cobrados con descuento de estudiante o profesor
+    total_centavos: int = 0    # En centavos para que las sumas sean exactas
+
+    @property
+    def total(self):
+        return self.total_centavos / 100
+
+
+def combinar_resumenes(resumenes):
+    # Suma campo por campo los resúmenes de varias taquillas
+    totales = [0] * len(ResumenVentas._fields)
+    for resumen in resumenes:
+        for posicion, valor in enumerate(resumen):
+            totales[posicion] += valor
+    return ResumenVentas(*totales)
+
+
+class Taquilla:
+    # Contadores propios de una taquilla. Solo la taquilla los modifica, así
+    # que varias taquillas (hilos o procesos) venden sin compartir totales
+    # ni candados; el resumen del día se arma combinando sus resúmenes.
+
+    def __init__(self, nombre, tarifas=None, bitacora=None):
+        self.nombre = nombre
+        self.tarifas = tarifas or TablaTarifas()
+        self.bitacora = bitacora   # BitacoraVentas opcional (una por taquilla)
+        self.visitantes = 0
+        self.gratis = 0
+        self.adultos_mayores = 0
+        self.estudiantes = 0
+        self.total_centavos = 0
+
+    def vender(self, edad, es_estudiante=False):
+        # Registra un visitante y regresa su pago
+        reglas = self.tarifas.reglas
+        pago = self.tarifas.precio(edad, es_estudiante)
+        centavos = round(pago * 100)
+        if self.bitacora is not None:
+            self.bitacora.registrar(*clasificar(edad, es_estudiante, reglas), centavos)
+        if edad < reglas["edad_gratis"]:
+            self.gratis += 1
+            return pago
+        if edad >= reglas["edad_adulto_mayor"]:
+            self.adultos_mayores += 1
+        elif es_estudiante:
+            self.estudiantes += 1
+        self.visitantes += 1
+        self.total_centavos += centavos
+        return pago
+
+    def vender_lote(self, edades, estudiantes=None):
+        # Registra un lote de visitantes (ej. los escaneos de una hora)
+        if np is None:
+            if estudiantes is None:
+                estudiantes = [False] * len(edades)
+            for edad, estudiante in zip(edades, estudiantes):
+                self.vender(edad, estudiante)
+            return
+
+        reglas = self.tarifas.reglas
+        edades = np.asarray(edades)
+        estudiantes = (np.zeros(len(edades), dtype=bool) if estudiantes is None
+                       else np.asarray(estudiantes, dtype=bool))
+        gratis = edades < reglas["edad_gratis"]
+        mayores = edades >= reglas["edad_adulto_mayor"]
+        self.gratis += int(np.count_nonzero(gratis))
+        self.visitantes += len(edades) - int(np.count_nonzero(gratis))
+        self.adultos_mayores += int(np.count_nonzero(mayores))
+        con_descuento = estudiantes & ~gratis & ~mayores
+        self.estudiantes += int(np.count_nonzero(con_descuento))
+        centavos = np.rint(self.tarifas.precios(edades, estudiantes) * 100).astype(np.int64)
+        self.total_centavos += int(centavos.sum())
+        if self.bitacora is not None:
+            limites = [reglas["edad_gratis"], reglas["edad_adulto"], reglas["edad_adulto_mayor"]]
+            bandas = np.searchsorted(limites, edades, side="right")
+            descuentos = np.where(mayores, 2, np.where(con_descuento, 1, 0))
+            self.bitacora.registrar_lote(bandas, descuentos, centavos)
+
+    def resumen(self):
+        return ResumenVentas(self.visitantes, self.gratis, self.adultos_mayores,
+                             self.estudiantes, self.total_centavos)
+
+
+class AgregadorTaquillas:
+    # Administra las taquillas del día; resumen_del_dia() combina sus
+    # contadores cuando se pide (no en cada venta)
+
+    def __init__(self, tarifas=None):
+        self.tarifas = tarifas or TablaTarifas()
+        self.taquillas = {}
+
+    def abrir_taquilla(self, nombre):
+        if nombre not in self.taquillas:
+            self.taquillas[nombre] = Taquilla(nombre, self.tarifas)
+        return self.taquillas[nombre]
+
+    def resumen_por_taquilla(self):
+        return {nombre: taquilla.resumen() for nombre, taquilla in self.taquillas.items()}
+
+    def resumen_del_dia(self):
+        return combinar_resumenes(taquilla.resumen() for taquilla in self.taquillas.values())
+
+
+def _vender_en_proceso(argumentos):
+    # Vende los lotes de una taquilla dentro de un proceso del pool
+    nombre, reglas, lotes = argumentos
+    taquilla = Taquilla(nombre, TablaTarifas(**reglas))
+    for edades, estudiantes in lotes:
+        taquilla.vender_lote(edades, estudiantes)
+    return nombre, taquilla.resumen()
+
+
+def vender_en_procesos(lotes_por_taquilla, tarifas=None, procesos=None):
+    # lotes_por_taquilla: {nombre: [(edades, estudiantes), ...]}. Cada
+    # taquilla vende en su propio proceso; regresa (resumen por taquilla,
+    # resumen del día)
+    reglas = (tarifas or TablaTarifas()).reglas
+    trabajos = [(nombre, reglas, lotes) for nombre, lotes in lotes_por_taquilla.items()]
+    with ProcessPoolExecutor(max_workers=procesos or os.cpu_count() or 1) as pool:
+        por_taquilla = dict(pool.map(_vender_en_proceso, trabajos))
+    return por_taquilla, combinar_resumenes(por_taquilla.values())
+
+
+# =====================================
+# Programa principal (taquilla interactiva)
+# =====================================
+def atender_taquilla(taquilla):
+    # Cobra visitantes uno por uno hasta que el operador decide terminar
+    reglas = taquilla.tarifas.reglas
+    while True:
+        try:
+            edad = int(input("Ingrese la edad del visitante: "))
+        except ValueError:
+            print("Por favor, ingrese un número válido para la edad.\n")
+            continue
+
+        if edad < reglas["edad_gratis"]:
+            taquilla.vender(edad)  # Solo se cuenta como entrada gratis
+            print(f"El visitante entra gratis por ser menor de {reglas['edad_gratis']} años.\n")
+            continue  # No se cobra
+
+        # Descuento
+        es_estudiante = False
+        if edad >= reglas["edad_adulto_mayor"]:
+            print(f"Descuento aplicado: Adulto mayor ({reglas['descuento_adulto_mayor']:.0%})")
+        else:
+            respuesta = input("¿Es estudiante o profesor? (s/n): ").lower()
+            es_estudiante = respuesta == 's'
+            if es_estudiante:
+                print(f"Descuento aplicado: Estudiante o Profesor ({reglas['descuento_estudiante']:.0%})")
+
+        pago = taquilla.vender(edad, es_estudiante)
+
+        print(f"Pago por este visitante: ${pago:,.2f}\n")
+
+        continuar = input("¿Desea registrar a otro visitante? (s/n): ").lower()
+        if continuar != 's':
+            break
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cobro de entradas al Museo")
+    parser.add_argument("--bitacora", help="Archivo donde se agregan las ventas del día")
+    parser.add_argument("--reporte", metavar="BITACORA",
+                        help="Muestra el reporte del día de una bitácora y termina")
+    args = parser.parse_args()
+    if args.reporte:
+        mostrar_reporte(reporte_del_dia(args.reporte))
+        return
+
+    print("Bienvenido al sistema de entradas del Museo de Arte e Historia de Guanajuato\n")
+
+    # En la taquilla interactiva cada venta se escribe al momento (bloques de 1)
+    bitacora = BitacoraVentas(args.bitacora, registros_por_bloque=1) if args.bitacora else None
+    taquilla = Taquilla("principal", bitacora=bitacora)   # La tabla de tarifas se construye una vez
+    try:
+        atender_taquilla(taquilla)
+    finally:
+        if bitacora is not None:
+            bitacora.cerrar()
 
-    print(f"Pago por este visitante: ${pago:,.2f}\n")
+    # Mostrar resumen final
+    resumen = taquilla.resumen()
+    print(f"\nSe registraron {resumen.visitantes} visitantes.")
+    print(f"Entraron gratis {resumen.gratis} menores de 3 años.")
+    print(f"Total a pagar: ${resumen.total:,.2f}")
 
-    continuar = input("¿Desea registrar a otro visitante? (s/n): ").lower()
-    if continuar != 's':
-        break
 
-# Mostrar resumen final
-print(f"\nSe registraron {contador_visitantes} visitantes.")
-print(f"Total a pagar: ${total_pagar:,.2f}")
\ No newline at end of file
+# =====================================
+# Punto de entrada
+# =====================================
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# Pruebas de Actividad02 (taquillas del museo)
+# Uso: python -m pytest test_actividad02.py  o  python -m unittest test_actividad02
+
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import Actividad02 as museo
+
+
+def visitantes_aleatorios(cantidad, semilla=23):
+    generador = random.Random(semilla)
+    edades = [generador.randint(0, 90) for _ in range(cantidad)]
+    estudiantes = [generador.random() < 0.3 for _ in range(cantidad)]
+    return edades, estudiantes
+
+
+class TaquillaTest(unittest.TestCase):
+
+    def test_lote_igual_a_ventas_individuales(self):
+        edades, estudiantes = visitantes_aleatorios(500)
+        individual = museo.Taquilla("A")
+        for edad, estudiante in zip(edades, estudiantes):
+            individual.vender(edad, estudiante)
+        por_lote = museo.Taquilla("B")
+        por_lote.vender_lote(edades[:200], estudiantes[:200])
+        por_lote.vender_lote(edades[200:], estudiantes[200:])
+        self.assertEqual(por_lote.resumen(), individual.resumen())
+
+    def test_lote_con_tarifas_configuradas(self):
+        edades, estudiantes = visitantes_aleatorios(300, semilla=5)
+        tarifas = museo.TablaTarifas(precio_adulto=60, edad_adulto_mayor=65)
+        individual = museo.Taquilla("A", tarifas)
+        for edad, estudiante in zip(edades, estudiantes):
+            individual.vender(edad, estudiante)
+        por_lote = museo.Taquilla("B", tarifas)
+        por_lote.vender_lote(edades, estudiantes)
+        self.assertEqual(por_lote.resumen(), individual.resumen())
+
+    def test_resumen_del_dia_combina_taquillas(self):
+        agregador = museo.AgregadorTaquillas()
+        agregador.abrir_taquilla("norte").vender(30)
+        agregador.abrir_taquilla("sur").vender(70)
+        agregador.abrir_taquilla("sur").vender(2)
+        resumenes = agregador.resumen_por_taquilla()
+        self.assertEqual(resumenes["norte"], museo.ResumenVentas(1, 0, 0, 0, 4500))
+        self.assertEqual(agregador.resumen_del_dia(),
+                         museo.combinar_resumenes(resumenes.values()))
+        self.assertEqual(agregador.resumen_del_dia().gratis, 1)
+
+
+class BitacoraVentasTest(unittest.TestCase):
+
+    def setUp(self):
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        self.directorio = directorio.name
+
+    def vender(self, nombre, por_lote):
+        ruta = os.path.join(self.directorio, nombre)
+        edades, estudiantes = visitantes_aleatorios(400)
+        with museo.BitacoraVentas(ruta, registros_por_bloque=64) as bitacora:
+            taquilla = museo.Taquilla(nombre, bitacora=bitacora)
+            if por_lote:
+                taquilla.vender_lote(edades, estudiantes)
+            else:
+                for edad, estudiante in zip(edades, estudiantes):
+                    taquilla.vender(edad, estudiante)
+        return ruta, taquilla.resumen()
+
+    def test_reporte_cuadra_con_la_taquilla(self):
+        ruta, resumen = self.vender("individual.bin", por_lote=False)
+        self.assertEqual(os.path.getsize(ruta), 400 * museo.BitacoraVentas.REGISTRO.size)
+        reporte = museo.reporte_del_dia(ruta, registros_por_bloque=50)
+        self.assertEqual(sum(centavos for _, centavos in reporte["por_banda"].values()),
+                         resumen.total_centavos)
+        self.assertEqual(reporte["por_banda"]["gratis"], [resumen.gratis, 0])
+        self.assertEqual(reporte["por_descuento"]["adulto_mayor"][0], resumen.adultos_mayores)
+        self.assertEqual(reporte["por_descuento"]["estudiante"][0], resumen.estudiantes)
+
+    def test_lote_escribe_los_mismos_registros(self):
+        ruta_individual, _ = self.vender("individual.bin", por_lote=False)
+        ruta_lote, _ = self.vender("lote.bin", por_lote=True)
+        with open(ruta_individual, "rb") as individual, open(ruta_lote, "rb") as lote:
+            self.assertEqual(lote.read(), individual.read())
+
+    def test_registro_incompleto_se_ignora(self):
+        ruta, _ = self.vender("cortada.bin", por_lote=False)
+        completo = museo.reporte_del_dia(ruta)
+        with open(ruta, "ab") as archivo:
+            archivo.write(b"\x02\x00\x10")   # Escritura interrumpida
+        self.assertEqual(museo.reporte_del_dia(ruta), completo)
+
+    def test_bitacora_se_agrega(self):
+        ruta = os.path.join(self.directorio, "dia.bin")
+        for _ in range(2):
+            with museo.BitacoraVentas(ruta) as bitacora:
+                museo.Taquilla("A", bitacora=bitacora).vender(30)
+        self.assertEqual(museo.reporte_del_dia(ruta)["por_banda"]["adulto"], [2, 9000])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,6 +5,13 @@
 # Docente: Jesús Carlos Morón García
 # Fecha de entrega: Septiembre 2025
 
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy solo es necesario para el modo "numpy"
+    np = None
+
 # =====================================
 # Función para generar la tabla (matriz)
 # =====================================
@@ -18,6 +25,79 @@ def generar_tabla(n=10):
         tabla.append(fila)
     return tabla
 
+# =====================================
+# Otras formas de guardar la tabla (para n grande)
+# =====================================
+# Todas se consultan con multiplicar(tabla, a, b) y se pueden imprimir con
+# mostrar_tabla, igual que la lista de listas.
+
+def generar_tabla_numpy(n=10):
+    # Producto exterior: n x n enteros de 8 bytes construidos en C
+    if np is None:
+        raise ImportError("El modo numpy requiere NumPy (pip install numpy)")
+    factores = np.arange(1, n + 1, dtype=np.int64)
+    return np.outer(factores, factores)
+
+
+class TablaCompacta:
+    # Tabla en un solo arreglo array('q') de n*n enteros de 8 bytes,
+    # fila por fila (sin una lista ni un objeto int por casilla)
+
+    def __init__(self, n=10):
+        self.n = n
+        self.datos = array("q")
+        for i in range(1, n + 1):
+            self.datos.extend(range(i, i * n + 1, i))  # fila i: i, 2i, ..., n*i
+
+    def __getitem__(self, indice):
+        fila, columna = indice
+        if not (0 <= fila < self.n and 0 <= columna < self.n):
+            raise IndexError("Índice fuera de la tabla")
+        return self.datos[fila * self.n + columna]
+
+    def __iter__(self):
+        for inicio in range(0, self.n * self.n, self.n):
+            yield self.datos[inicio:inicio + self.n]
+
+    def __len__(self):
+        return self.n
+
+
+class TablaVirtual:
+    # Tabla que no guarda nada: cada casilla se calcula al consultarla, en
+    # O(1) de tiempo y memoria para cualquier n
+
+    def __init__(self, n=10):
+        self.n = n
+
+    def __getitem__(self, indice):
+        fila, columna = indice
+        if not (0 <= fila < self.n and 0 <= columna < self.n):
+            raise IndexError("Índice fuera de la tabla")
+        return (fila + 1) * (columna + 1)
+
+    def __iter__(self):
+        for i in range(1, self.n + 1):
+            yield range(i, i * self.n + 1, i)
+
+    def __len__(self):
+        return self.n
+
+
+MODOS_TABLA = {
+    "lista": generar_tabla,
+    "numpy": generar_tabla_numpy,
+    "compacta": TablaCompacta,
+    "virtual": TablaVirtual,
+}
+
+
+def crear_tabla(n=10, modo="lista"):
+    # Construye la tabla con el modo indicado (ver MODOS_TABLA)
+    if modo not in MODOS_TABLA:
+        raise ValueError(f"Modo desconocido: {modo} (usa {', '.join(MODOS_TABLA)})")
+    return MODOS_TABLA[modo](n)
+
 # =====================================
 # Función que NO regresa valor (imprime tabla)
 # =====================================
@@ -33,7 +113,10 @@ def mostrar_tabla(tabla):
 # =====================================
 def multiplicar(tabla, a, b):
     # Como las listas empiezan en 0, restamos 1 a cada índice
-    return tabla[a-1][b-1]
+    if isinstance(tabla, list):
+        return tabla[a-1][b-1]
+    # NumPy, compacta o virtual: se consultan con (fila, columna)
+    return int(tabla[a-1, b-1])
 
 # =====================================
 # Programa principal
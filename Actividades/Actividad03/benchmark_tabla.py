@@ -0,0 +1,107 @@
+"""
+Benchmark de la tabla de Pitágoras
+==================================
+
+Compara los modos de Actividad03.crear_tabla (lista, numpy, compacta y
+virtual) para distintos tamaños n:
+
+- Tiempo de construcción de la tabla n x n.
+- Memoria reservada al construirla (pico de tracemalloc).
+- Tiempo promedio de multiplicar(tabla, a, b) con factores al azar.
+
+Los modos cuya tabla estimada no cabe en --memoria-max se omiten (por
+ejemplo, n = 10^5 solo es posible con la tabla virtual: la lista de listas
+ocuparía cientos de GB).
+
+Uso:
+    python benchmark_tabla.py [--tamanos 10 100 1000 10000 100000]
+                              [--memoria-max 512] [--consultas 100000]
+                              [--salida resultados.json]
+"""
+
+import argparse
+import json
+import random
+import time
+import tracemalloc
+
+from Actividad03 import MODOS_TABLA, crear_tabla, multiplicar, np
+
+# Bytes aproximados por casilla, para decidir si un modo cabe en memoria
+# (lista: apuntador de 8 bytes + objeto int de 32 bytes)
+BYTES_POR_CASILLA = {"lista": 40, "numpy": 8, "compacta": 8, "virtual": 0}
+
+
+def medir(modo, n, consultas, semilla):
+    # Construye la tabla dos veces: una para el tiempo y otra, con
+    # tracemalloc activo, para la memoria (tracemalloc hace lenta la medición)
+    inicio = time.perf_counter()
+    tabla = crear_tabla(n, modo)
+    construccion = time.perf_counter() - inicio
+    del tabla
+
+    tracemalloc.start()
+    tabla = crear_tabla(n, modo)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    rng = random.Random(semilla)
+    factores = [(rng.randint(1, n), rng.randint(1, n)) for _ in range(consultas)]
+    inicio = time.perf_counter()
+    for a, b in factores:
+        multiplicar(tabla, a, b)
+    consulta = (time.perf_counter() - inicio) / consultas
+
+    return {"construccion_s": construccion, "memoria_bytes": pico, "consulta_us": consulta * 1e6}
+
+
+def correr(tamanos, memoria_max, consultas, semilla):
+    resultados = []
+    for n in tamanos:
+        for modo in MODOS_TABLA:
+            fila = {"n": n, "modo": modo}
+            if modo == "numpy" and np is None:
+                fila["omitido"] = "NumPy no está instalado"
+            elif BYTES_POR_CASILLA[modo] * n * n > memoria_max:
+                fila["omitido"] = f"~{BYTES_POR_CASILLA[modo] * n * n / 2**20:,.0f} MB estimados"
+            else:
+                fila.update(medir(modo, n, consultas, semilla))
+            resultados.append(fila)
+    return resultados
+
+
+def mostrar_resultados(resultados):
+    print(f"{'n':>8}  {'modo':<9}{'construcción':>14}{'memoria':>14}{'multiplicar':>14}")
+    for fila in resultados:
+        if "omitido" in fila:
+            print(f"{fila['n']:>8,}  {fila['modo']:<9}  omitido ({fila['omitido']})")
+            continue
+        print(f"{fila['n']:>8,}  {fila['modo']:<9}"
+              f"{fila['construccion_s'] * 1e3:>11,.3f} ms"
+              f"{fila['memoria_bytes'] / 2**20:>11,.2f} MB"
+              f"{fila['consulta_us']:>11,.3f} µs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la tabla de Pitágoras")
+    parser.add_argument("--tamanos", type=int, nargs="+",
+                        default=[10, 100, 1000, 10000, 100000],
+                        help="Valores de n a medir (default: 10 100 1000 10000 100000)")
+    parser.add_argument("--memoria-max", type=int, default=512,
+                        help="MB máximos por tabla; los modos que no caben se omiten (default: 512)")
+    parser.add_argument("--consultas", type=int, default=100000,
+                        help="Llamadas a multiplicar por medición (default: 100000)")
+    parser.add_argument("--semilla", type=int, default=2025, help="Semilla (default: 2025)")
+    parser.add_argument("--salida", help="Archivo JSON donde guardar los resultados")
+    args = parser.parse_args()
+
+    resultados = correr(args.tamanos, args.memoria_max * 2**20, args.consultas, args.semilla)
+    mostrar_resultados(resultados)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(resultados, archivo, ensure_ascii=False, indent=2)
+        print(f"\nResultados guardados en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# Pruebas de Actividad03 (formas de guardar la tabla de Pitágoras)
+# Uso: python -m pytest test_actividad03.py  o  python -m unittest test_actividad03
+
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import Actividad03 as pitagoras
+
+
+def modos_disponibles():
+    # El modo numpy solo se prueba si NumPy está instalado
+    return [modo for modo in pitagoras.MODOS_TABLA
+            if modo != "numpy" or pitagoras.np is not None]
+
+
+def impresion(tabla):
+    salida = io.StringIO()
+    with contextlib.redirect_stdout(salida):
+        pitagoras.mostrar_tabla(tabla)
+    return salida.getvalue()
+
+
+class TablaTest(unittest.TestCase):
+
+    def test_todos_los_modos_multiplican_igual(self):
+        n = 12
+        for modo in modos_disponibles():
+            with self.subTest(modo=modo):
+                tabla = pitagoras.crear_tabla(n, modo)
+                self.assertEqual(len(tabla), n)
+                for a in range(1, n + 1):
+                    for b in range(1, n + 1):
+                        self.assertEqual(pitagoras.multiplicar(tabla, a, b), a * b)
+
+    def test_todos_los_modos_se_imprimen_igual(self):
+        esperado = impresion(pitagoras.generar_tabla(10))
+        for modo in modos_disponibles():
+            with self.subTest(modo=modo):
+                self.assertEqual(impresion(pitagoras.crear_tabla(10, modo)), esperado)
+
+    def test_fuera_de_la_tabla(self):
+        for modo in ("compacta", "virtual"):
+            tabla = pitagoras.crear_tabla(5, modo)
+            with self.subTest(modo=modo):
+                with self.assertRaises(IndexError):
+                    pitagoras.multiplicar(tabla, 6, 1)
+                with self.assertRaises(IndexError):
+                    pitagoras.multiplicar(tabla, 1, 0)
+
+    def test_modo_desconocido(self):
+        with self.assertRaises(ValueError):
+            pitagoras.crear_tabla(10, "disco")
+
+
+if __name__ == "__main__":
+    unittest.main()
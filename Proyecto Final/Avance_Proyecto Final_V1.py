@@ -31,59 +31,313 @@ Convenciones y notas
 - Entradas inválidas se re-preguntan con `continue`.
 - Si escribes 'salir' cuando se pide el NOMBRE del inquilino, se usa `break`
   para salir del registro del resto de contratos.
+
+Validación en lote
+------------------
+Las mismas reglas de captura (parse_int/parse_float/parse_str) validan
+archivos completos de contratos (CSV o JSONL) columna por columna:
+
+    python "Avance_Proyecto Final_V1.py" --validar contratos.csv [--procesos 4]
 """
 
 from __future__ import annotations
-from dataclasses import dataclass
+
+import argparse
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from itertools import repeat
+from pathlib import Path
+from typing import Callable
 
 
 # =========================
 # Utilidades de validación
 # =========================
 
-def ask_int(prompt: str, min_val: int | None = None, max_val: int | None = None) -> int:
-    """Pide un entero con validación de rango. Re-pregunta hasta ser válido (usa `continue`)."""
+class RangeError(ValueError):
+    """Valor bien escrito pero fuera del rango permitido."""
+
+
+def parse_int(raw: str, min_val: int | None = None, max_val: int | None = None) -> int:
+    """Convierte texto a entero con validación de rango. Lanza ValueError si no es válido."""
+    try:
+        val = int(str(raw).strip())
+    except ValueError:
+        raise ValueError("Ingresa un entero válido.") from None
+    if (min_val is not None and val < min_val) or (max_val is not None and val > max_val):
+        raise RangeError(f"Debe estar entre {min_val} y {max_val}.")
+    return val
+
+
+def parse_float(raw: str, min_val: float | None = None) -> float:
+    """Convierte texto a real (acepta coma decimal). Lanza ValueError si no es válido."""
+    try:
+        val = float(str(raw).strip().replace(",", "."))
+    except ValueError:
+        raise ValueError("Ingresa un número válido (puede llevar decimales).") from None
+    if min_val is not None and val < min_val:
+        raise RangeError(f"Debe ser ≥ {min_val}.")
+    return val
+
+
+def parse_str(raw: str) -> str:
+    """Valida una cadena no vacía. Lanza ValueError si está vacía."""
+    s = str(raw).strip()
+    if not s:
+        raise RangeError("No dejes vacío.")
+    return s
+
+
+def _ask(prompt: str, parse: Callable[[str], object]):
+    """Pide un dato hasta que `parse` lo acepte (usa `continue`)."""
     while True:
-        raw = input(prompt).strip()
         try:
-            val = int(raw)
-            if (min_val is not None and val < min_val) or (max_val is not None and val > max_val):
-                print(f"  ⚠️  Debe estar entre {min_val} y {max_val}. Intenta de nuevo.")
-                continue
-            return val
-        except ValueError:
-            print("  ⚠️  Ingresa un entero válido.")
+            return parse(input(prompt))
+        except RangeError as error:
+            print(f"  ⚠️  {error} Intenta de nuevo.")
+            continue
+        except ValueError as error:
+            print(f"  ⚠️  {error}")
+
+
+def ask_int(prompt: str, min_val: int | None = None, max_val: int | None = None) -> int:
+    """Pide un entero con validación de rango. Re-pregunta hasta ser válido (usa `continue`)."""
+    return _ask(prompt, partial(parse_int, min_val=min_val, max_val=max_val))
 
 
 def ask_float(prompt: str, min_val: float | None = None) -> float:
     """Pide un número real (float). Re-pregunta hasta ser válido (usa `continue`)."""
-    while True:
-        raw = input(prompt).strip().replace(",", ".")
-        try:
-            val = float(raw)
-            if min_val is not None and val < min_val:
-                print(f"  ⚠️  Debe ser ≥ {min_val}. Intenta de nuevo.")
-                continue
-            return val
-        except ValueError:
-            print("  ⚠️  Ingresa un número válido (puede llevar decimales).")
+    return _ask(prompt, partial(parse_float, min_val=min_val))
 
 
 def ask_str(prompt: str) -> str:
     """Pide una cadena no vacía (salvo que el usuario ponga 'salir' para abortar el resto)."""
-    while True:
-        s = input(prompt).strip()
-        if not s:
-            print("  ⚠️  No dejes vacío. Intenta de nuevo.")
+    return _ask(prompt, parse_str)
+
+
+# =========================
+# Validación en lote
+# =========================
+
+# Columna -> (regla de captura, obligatoria). Las columnas opcionales vacías
+# se aceptan (en la captura equivalen a 0 o a "no aplica"), salvo la renta de
+# los contratos fuera de 2024–2025 (ver validate_columns).
+COLUMN_RULES: dict[str, tuple[Callable[[str], object], bool]] = {
+    "tenant_name": (parse_str, True),
+    "unit_code": (parse_str, True),
+    "bedrooms": (partial(parse_int, min_val=3, max_val=4), True),
+    "start_month": (partial(parse_int, min_val=1, max_val=12), True),
+    "start_year": (parse_int, True),
+    "monthly_rent": (partial(parse_float, min_val=0.0), False),
+    "paid_months": (partial(parse_float, min_val=0.0), False),
+    "paid_amount": (partial(parse_float, min_val=0.0), False),
+}
+
+STANDARD_YEARS = range(2024, 2026)  # Años con renta estándar por recámaras
+RECORD_COLUMN = "(registro)"  # Columna del reporte para líneas que no se pudieron leer
+MAX_EXAMPLES = 5  # Registros de ejemplo por tipo de error en el reporte
+
+
+@dataclass(slots=True)
+class ValidationReport:
+    """Resultado compacto: cuántos registros fallan cada regla y algunos ejemplos."""
+    rows: int = 0
+    counts: dict[tuple[str, str], int] = field(default_factory=dict)
+    examples: dict[tuple[str, str], list[int]] = field(default_factory=dict)
+    invalid_rows: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return not self.counts
+
+    def add_error(self, column: str, message: str, row: int) -> None:
+        key = (column, message)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        examples = self.examples.setdefault(key, [])
+        if len(examples) < MAX_EXAMPLES:
+            examples.append(row)
+
+    def merge(self, other: "ValidationReport", offset: int = 0) -> None:
+        """Suma el reporte de otro bloque; sus registros se renumeran sumando `offset`."""
+        self.rows += other.rows
+        self.invalid_rows += other.invalid_rows
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+            examples = self.examples.setdefault(key, [])
+            examples.extend(row + offset for row in other.examples[key][:MAX_EXAMPLES - len(examples)])
+
+    def summary(self) -> str:
+        """Texto del reporte (una línea por tipo de error)."""
+        lines = [f"Registros revisados: {self.rows:,}  |  con errores: {self.invalid_rows:,}"]
+        for (column, message), count in sorted(self.counts.items(), key=lambda item: (-item[1], item[0])):
+            rows = ", ".join(str(row) for row in self.examples[(column, message)])
+            lines.append(f"  {column}: {message} — {count:,} registro(s) (ej. {rows})")
+        if self.ok:
+            lines.append("  ✅ Sin errores.")
+        return "\n".join(lines)
+
+
+def _historic_rent_error(start_year: object, monthly_rent: object) -> str | None:
+    """Regla entre columnas: un contrato fuera de 2024–2025 necesita renta histórica > 0."""
+    try:
+        if parse_int(start_year) in STANDARD_YEARS:
+            return None
+    except ValueError:
+        return None  # El año ya se reporta en su columna
+    if monthly_rent is None or str(monthly_rent).strip() == "":
+        return "Obligatoria en contratos fuera de 2024–2025."
+    try:
+        rent = parse_float(monthly_rent)
+    except ValueError:
+        return None  # Ya se reporta en su columna
+    return None if rent > 0 else "Debe ser > 0 en contratos fuera de 2024–2025."
+
+
+def validate_columns(columns: dict[str, list], first_row: int = 1,
+                     read_errors: dict[int, str] | None = None) -> ValidationReport:
+    """
+    Valida columnas completas (columna -> lista de valores, todas del mismo largo)
+    con las reglas de COLUMN_RULES. Cada regla se aplica una sola vez por valor
+    distinto de la columna (meses, años y recámaras se repiten mucho) y solo
+    se recorre la columna completa para ubicar los registros con error.
+    `read_errors` (posición -> mensaje) son los registros que no se pudieron
+    leer; se reportan tal cual y no se validan sus columnas.
+    Los registros se numeran desde `first_row`.
+    """
+    read_errors = read_errors or {}
+    rows = len(next(iter(columns.values()), [])) or len(read_errors)
+    report = ValidationReport(rows=rows)
+    for position, message in read_errors.items():
+        report.add_error(RECORD_COLUMN, message, first_row + position)
+    bad_rows: set[int] = set(read_errors)
+    for column, (parse, required) in COLUMN_RULES.items():
+        values = columns.get(column)
+        if values is None:
+            if required:
+                report.add_error(column, "Falta la columna.", first_row)
+                bad_rows.update(range(rows))
             continue
-        return s
+
+        # Valor distinto -> mensaje de error
+        bad: dict[object, str] = {}
+        for raw in set(values):
+            if raw is None or str(raw).strip() == "":
+                if required:
+                    bad[raw] = "No dejes vacío."
+                continue
+            try:
+                parse(raw)
+            except ValueError as error:
+                bad[raw] = str(error)
+        if not bad:
+            continue
+        for position, raw in enumerate(values):
+            if raw in bad and position not in read_errors:
+                report.add_error(column, bad[raw], first_row + position)
+                bad_rows.add(position)
+
+    # Renta histórica: se evalúa una vez por par (año, renta) distinto
+    years = columns.get("start_year")
+    if years is not None:
+        rents = columns.get("monthly_rent") or repeat(None)
+        bad_pairs = {pair: message for pair in set(zip(years, rents))
+                     if (message := _historic_rent_error(*pair)) is not None}
+        if bad_pairs:
+            rents = columns.get("monthly_rent") or repeat(None)
+            for position, pair in enumerate(zip(years, rents)):
+                if pair in bad_pairs and position not in read_errors:
+                    report.add_error("monthly_rent", bad_pairs[pair], first_row + position)
+                    bad_rows.add(position)
+    report.invalid_rows = len(bad_rows)
+    return report
+
+
+def read_columns(path: str, start: int = 0,
+                 end: int | None = None) -> tuple[dict[str, list], dict[int, str]]:
+    """
+    Lee un CSV (con encabezados) o JSONL y lo regresa por columnas, junto con
+    los registros que no se pudieron leer (posición -> mensaje; en esas
+    posiciones las columnas quedan en None). Con `start`/`end` (bytes) solo
+    lee los registros que empiezan en ese rango, para que cada proceso lea
+    su propia parte del archivo.
+    """
+    is_json = Path(path).suffix.lower() in (".jsonl", ".json")
+    with open(path, "rb") as handle:
+        header = [] if is_json else next(csv.reader([handle.readline().decode("utf-8-sig")]), [])
+        if start > handle.tell():
+            handle.seek(start - 1)
+            handle.readline()  # Termina el registro que empezó antes del rango
+        if end is None:
+            lines = handle.readlines()
+        else:
+            lines = []
+            while handle.tell() < end:
+                line = handle.readline()
+                if not line:
+                    break
+                lines.append(line)
+
+    text = [line.decode("utf-8") for line in lines if line.strip()]
+    if is_json:
+        records = []
+        errors: dict[int, str] = {}
+        for position, line in enumerate(text):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            if not isinstance(record, dict):
+                errors[position] = "No es un objeto JSON válido."
+                record = {}
+            records.append(record)
+        names = {name for record in records for name in record}
+        return {name: [record.get(name) for record in records] for name in names}, errors
+    # Sin comillas y con el mismo número de comas en cada línea, el bloque se
+    # separa de una vez y cada columna es un corte (sin listas por registro)
+    data = "".join(line if line.endswith("\n") else line + "\n" for line in text).replace("\r\n", "\n")
+    if '"' not in data and set(map(str.count, text, repeat(","))) <= {len(header) - 1}:
+        fields = data.replace("\n", ",").split(",")[:-1] if data else []
+        return {name: fields[position::len(header)] for position, name in enumerate(header)}, {}
+    rows = list(csv.reader(text))
+    return {name: [row[position] if position < len(row) else "" for row in rows]
+            for position, name in enumerate(header)}, {}
+
+
+def _validate_range(args: tuple[str, int, int]) -> ValidationReport:
+    """Lee y valida un rango de bytes del archivo (se ejecuta en un proceso del pool)."""
+    path, start, end = args
+    columns, read_errors = read_columns(path, start, end)
+    return validate_columns(columns, read_errors=read_errors)
+
+
+def validate_file(path: str, workers: int | None = None) -> ValidationReport:
+    """
+    Valida un archivo de contratos completo. Con workers > 1 el archivo se
+    divide en rangos de bytes y cada proceso lee y valida el suyo, así que
+    la lectura también se reparte.
+    """
+    size = os.path.getsize(path)
+    if not workers or workers <= 1:
+        return _validate_range((path, 0, None))
+
+    step = size // workers + 1
+    ranges = [(path, start, min(start + step, size)) for start in range(0, size, step)]
+    report = ValidationReport()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk_report in executor.map(_validate_range, ranges):
+            report.merge(chunk_report, offset=report.rows)
+    return report
 
 
 # =========================
 # Modelo de dominio (OOP)
 # =========================
 
-@dataclass
+@dataclass(slots=True)
 class BaseContract:
     """Contrato base: datos comunes y utilidades de cálculo."""
     tenant_name: str
@@ -121,7 +375,7 @@ class BaseContract:
         return adeudo_esperado, 0.0, diferencia
 
 
-@dataclass
+@dataclass(slots=True)
 class StandardContract(BaseContract):
     """Contrato vigente 2024–2025. Establece la renta estándar según #recámaras."""
     bedrooms: int = 3
@@ -139,7 +393,7 @@ class StandardContract(BaseContract):
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class HistoricContract(BaseContract):
     """Contrato en prórroga (no vigente 2024–2025). Usa la renta histórica capturada."""
     pass
@@ -209,18 +463,21 @@ class BuildingManager:
             expected, due, in_favor = contract.balance(self.month_current, months_paid, amount_paid)
             self.total_building += amount_paid
 
-            # Salida por inquilino
-            print("\nResumen")
-            print(f"  Inquilino: {tenant_name}  |  Depto: {unit_code}")
-            print(f"  Renta mensual: ${contract.monthly_rent:,.2f}")
-            print(f"  Meses transcurridos en {self.year_current}: {self.month_current}")
-            print(f"  Meses pagados en {self.year_current}: {months_paid:.2f}")
-            print(f"  Monto pagado en {self.year_current}: ${amount_paid:,.2f}")
-            print(f"  Debió pagar a la fecha: ${expected:,.2f}")
+            # Salida por inquilino (se arma completa y se imprime una sola vez)
+            summary = [
+                "\nResumen",
+                f"  Inquilino: {tenant_name}  |  Depto: {unit_code}",
+                f"  Renta mensual: ${contract.monthly_rent:,.2f}",
+                f"  Meses transcurridos en {self.year_current}: {self.month_current}",
+                f"  Meses pagados en {self.year_current}: {months_paid:.2f}",
+                f"  Monto pagado en {self.year_current}: ${amount_paid:,.2f}",
+                f"  Debió pagar a la fecha: ${expected:,.2f}",
+            ]
             if due > 0:
-                print(f"  * Adeudo actual: ${due:,.2f}")
+                summary.append(f"  * Adeudo actual: ${due:,.2f}")
             if in_favor > 0:
-                print(f"  * Saldo a favor: ${in_favor:,.2f}")
+                summary.append(f"  * Saldo a favor: ${in_favor:,.2f}")
+            print("\n".join(summary))
 
     def print_total(self) -> None:
         print("\n=============================================")
@@ -233,6 +490,18 @@ class BuildingManager:
 # =========================
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Control de Contratos y Pagos")
+    parser.add_argument("--validar", metavar="ARCHIVO",
+                        help="Valida un archivo CSV/JSONL de contratos con las reglas de captura")
+    parser.add_argument("--procesos", type=int, default=1,
+                        help="Procesos para la validación (default: 1; 0 = núcleos)")
+    args = parser.parse_args()
+    if args.validar:
+        workers = args.procesos or os.cpu_count() or 1
+        report = validate_file(args.validar, workers)
+        print(report.summary())
+        raise SystemExit(0 if report.ok else 1)
+
     print("\n=== Control de Contratos y Pagos — 2025 ===\n")
 
     year_current = ask_int("Año actual (AAAA): ")
@@ -9,182 +9,511 @@ Este programa implementa un sistema orientado a objetos para el control
 de pagos de renta de un edificio con 16 departamentos.
 """
 
-from abc import ABC, abstractmethod
-from typing import List, Tuple
+import argparse
+import bisect
+import csv
+import gzip
+import heapq
+import io
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, TextIO, Tuple
 
+try:
+    import numpy as np
+except ImportError:  # NumPy solo es necesario para ContractTable
+    np = None
 
-class BaseContract(ABC):
+# El modelo y la infraestructura viven en el paquete contratos; los nombres
+# se importan aquí para que el módulo siga ofreciendo la misma interfaz
+from contratos import modelo
+from contratos.modelo import (BaseContract, HistoricContract, PaymentEntry, RentSchedule,
+                              StandardContract, build_contract, contract_from_record,
+                              from_cents, iter_contract_records, iter_contracts,
+                              to_cents, validate_month)
+from contratos.perfil import Profiler
+from contratos.persistencia import (ContractRepository, ContractRoster, ContractSnapshot,
+                                    FileRoster, RepositoryRoster, SnapshotRecord)
+from contratos.servicio import PaymentService, run_payment_service
+
+
+class ContractTable:
     """
-    Clase base abstracta que define los atributos y métodos comunes
-    para todos los tipos de contratos de renta.
+    Almacén columnar de contratos respaldado por arreglos de NumPy.
+    
+    Cada atributo es un arreglo con una posición por contrato, de modo que
+    adeudos y saldos de todo el portafolio se calculan sin ciclos de Python.
+    Los montos se guardan en centavos (int64) para que las sumas sean exactas;
+    monthly_rent y paid_amount los exponen en pesos.
+    En la columna bedrooms, los contratos históricos se guardan como 0.
+    La tabla solo maneja renta fija: no admite contratos con programa de
+    rentas.
     """
     
-    def __init__(self, tenant_name: str, unit_code: str, start_month: int, 
-                 start_year: int, monthly_rent: float):
+    def __init__(self, monthly_rent, paid_months, paid_amount, start_month,
+                 start_year, bedrooms):
         """
-        Inicializa un contrato base.
+        Inicializa la tabla a partir de columnas (listas o arreglos).
         
         Args:
-            tenant_name (str): Nombre del inquilino
-            unit_code (str): Código del departamento (ej. D101, D202)
-            start_month (int): Mes de inicio del contrato (1-12)
-            start_year (int): Año de inicio del contrato
-            monthly_rent (float): Renta mensual
+            monthly_rent: Renta mensual de cada contrato
+            paid_months: Meses pagados en el año actual
+            paid_amount: Monto pagado en el año actual
+            start_month: Mes de inicio del contrato (1-12)
+            start_year: Año de inicio del contrato
+            bedrooms: Número de recámaras (0 en contratos históricos)
         """
-        self.tenant_name = tenant_name
-        self.unit_code = unit_code
-        self.start_month = start_month
-        self.start_year = start_year
-        self.monthly_rent = monthly_rent
-        self._paid_months = 0.0
-        self._paid_amount = 0.0
+        if np is None:
+            raise ImportError("ContractTable requiere NumPy (pip install numpy)")
+        
+        self.rent_cents = np.rint(np.asarray(monthly_rent, dtype=np.float64) * 100).astype(np.int64)
+        self.paid_months = np.asarray(paid_months, dtype=np.float64)
+        self.paid_cents = np.rint(np.asarray(paid_amount, dtype=np.float64) * 100).astype(np.int64)
+        self.start_month = np.asarray(start_month, dtype=np.int8)
+        self.start_year = np.asarray(start_year, dtype=np.int16)
+        self.bedrooms = np.asarray(bedrooms, dtype=np.int8)
+        
+        size = len(self.rent_cents)
+        for column in (self.paid_months, self.paid_cents, self.start_month,
+                       self.start_year, self.bedrooms):
+            if len(column) != size:
+                raise ValueError("Todas las columnas deben tener la misma longitud")
     
-    def set_payments(self, paid_months: float = 0.0, paid_amount: float = 0.0):
+    @classmethod
+    def from_contracts(cls, contracts: Iterable[BaseContract]) -> "ContractTable":
         """
-        Establece los pagos realizados en el año actual.
+        Construye la tabla a partir de objetos de contrato. Lanza ValueError
+        si alguno tiene cambios de renta, en lugar de perderlos.
         
         Args:
-            paid_months (float): Meses pagados
-            paid_amount (float): Monto pagado
+            contracts (Iterable[BaseContract]): Contratos a convertir
+            
+        Returns:
+            ContractTable: Tabla con una fila por contrato
         """
-        self._paid_months = paid_months
-        self._paid_amount = paid_amount
+        columns: Tuple[List, ...] = ([], [], [], [], [], [])
+        for contract in contracts:
+            if contract.schedule is not None:
+                raise ValueError(f"El contrato de {contract.unit_code} tiene cambios de renta; "
+                                 "ContractTable solo maneja renta fija")
+            paid_months, paid_amount = contract.get_payment_info()
+            columns[0].append(contract.monthly_rent)
+            columns[1].append(paid_months)
+            columns[2].append(paid_amount)
+            columns[3].append(contract.start_month)
+            columns[4].append(contract.start_year)
+            columns[5].append(getattr(contract, "bedrooms", 0))
+        return cls(*columns)
+    
+    def __len__(self) -> int:
+        return len(self.rent_cents)
+    
+    @property
+    def monthly_rent(self):
+        """Renta mensual de cada contrato, en pesos."""
+        return self.rent_cents / 100
+    
+    @property
+    def paid_amount(self):
+        """Monto pagado de cada contrato, en pesos."""
+        return self.paid_cents / 100
     
-    def infer_months_or_amount(self) -> Tuple[float, float]:
+    def infer_months_or_amount(self):
         """
-        Infiere los meses pagados o el monto pagado basándose en el otro valor.
-        Si meses_pagados = 0, infiere por monto.
-        Si monto = 0, infiere por meses.
+        Infiere meses o monto pagado para todas las filas, con la misma regla
+        que BaseContract.infer_months_or_amount.
         
         Returns:
-            Tuple[float, float]: (meses_pagados, monto_pagado)
+            Tuple[np.ndarray, np.ndarray]: (meses_pagados, monto_pagado)
         """
-        if self._paid_months == 0 and self.monthly_rent > 0:
-            self._paid_months = self._paid_amount / self.monthly_rent
-        
-        if self._paid_amount == 0:
-            self._paid_amount = self._paid_months * self.monthly_rent
-            
-        return self._paid_months, self._paid_amount
+        rent = self.rent_cents
+        by_amount = (self.paid_months == 0) & (rent > 0)
+        inferred = np.divide(self.paid_cents, rent,
+                             out=np.zeros_like(self.paid_months), where=by_amount)
+        self.paid_months = np.where(by_amount, inferred, self.paid_months)
+        self.paid_cents = np.where(self.paid_cents == 0,
+                                   np.rint(self.paid_months * rent).astype(np.int64),
+                                   self.paid_cents)
+        return self.paid_months, self.paid_amount
     
-    def expected_due(self, current_month: int) -> float:
+    def expected_due(self, current_month: int):
         """
-        Calcula el adeudo esperado hasta el mes actual.
+        Calcula el adeudo esperado de cada contrato hasta el mes actual.
         
         Args:
             current_month (int): Mes actual (1-12)
             
         Returns:
-            float: Monto que debería haber pagado hasta la fecha
+            np.ndarray: Monto que debería haber pagado cada contrato
         """
-        return current_month * self.monthly_rent
+        return current_month * self.rent_cents / 100
     
-    def balance(self, current_month: int) -> Tuple[float, float]:
+    def balance_cents(self, current_month: int):
         """
-        Calcula el balance del contrato (adeudo o saldo a favor).
+        Calcula adeudo y saldo a favor de todas las filas, en centavos.
         
         Args:
             current_month (int): Mes actual
             
         Returns:
-            Tuple[float, float]: (adeudo, saldo_a_favor)
+            Tuple[np.ndarray, np.ndarray]: (adeudo, saldo_a_favor) en centavos
         """
-        # Asegurar que los valores están actualizados
         self.infer_months_or_amount()
-        
-        expected_amount = self.expected_due(current_month)
-        difference = self._paid_amount - expected_amount
-        
-        if difference < 0:
-            return -difference, 0.0  # Tiene adeudo
-        else:
-            return 0.0, difference   # Tiene saldo a favor
+        difference = self.paid_cents - current_month * self.rent_cents
+        return np.maximum(-difference, 0), np.maximum(difference, 0)
     
-    def get_payment_info(self) -> Tuple[float, float]:
+    def balance(self, current_month: int):
         """
-        Obtiene la información de pagos actuales.
+        Calcula adeudo y saldo a favor de todas las filas.
         
+        Args:
+            current_month (int): Mes actual
+            
         Returns:
-            Tuple[float, float]: (meses_pagados, monto_pagado)
+            Tuple[np.ndarray, np.ndarray]: (adeudo, saldo_a_favor)
         """
-        return self._paid_months, self._paid_amount
+        debt, credit = self.balance_cents(current_month)
+        return debt / 100, credit / 100
+
+
+REPORT_FORMATS = ("texto", "csv", "json")
+
+REPORT_FIELDS = ("tenant_name", "unit_code", "contract_type", "monthly_rent",
+                 "paid_months", "paid_amount", "expected_due", "debt", "credit")
+
+
+def open_report(path: str) -> TextIO:
+    """
+    Abre un archivo de reporte para escritura de texto; si la ruta termina
+    en .gz se comprime con gzip.
     
-    @abstractmethod
-    def get_contract_type(self) -> str:
-        """
-        Método abstracto que debe ser implementado por las clases hijas
-        para identificar el tipo de contrato.
-        """
-        pass
+    Args:
+        path (str): Ruta del reporte
+        
+    Returns:
+        TextIO: Flujo de texto abierto
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def contract_summary_row(contract: BaseContract, current_month: int,
+                         current_year: Optional[int] = None) -> Dict[str, object]:
+    """
+    Obtiene los datos del resumen de un contrato al mes indicado.
+    
+    Args:
+        contract (BaseContract): Contrato a resumir
+        current_month (int): Mes actual
+        current_year (Optional[int]): Año actual (para el programa de rentas)
+        
+    Returns:
+        Dict[str, object]: Valores con las llaves de REPORT_FIELDS
+    """
+    paid_months, paid_amount = contract.get_payment_info()
+    adeudo, saldo_favor = contract.balance(current_month, current_year)
+    return {
+        "tenant_name": contract.tenant_name,
+        "unit_code": contract.unit_code,
+        "contract_type": contract.get_contract_type(),
+        "monthly_rent": contract.rent_at(current_month, current_year),
+        "paid_months": paid_months,
+        "paid_amount": paid_amount,
+        "expected_due": contract.expected_due(current_month, current_year),
+        "debt": adeudo,
+        "credit": saldo_favor,
+    }
+
+
+def format_contract_summary(row: Dict[str, object], current_year: int,
+                            current_month: int) -> str:
+    """
+    Construye el texto del resumen de un contrato.
+    
+    Args:
+        row (Dict[str, object]): Datos de contract_summary_row
+        current_year (int): Año actual
+        current_month (int): Mes actual
+        
+    Returns:
+        str: Resumen con salto de línea final
+    """
+    lines = [
+        f"\nResumen de {row['tenant_name']} (Depto: {row['unit_code']})",
+        f"  Tipo de contrato: {row['contract_type']}",
+        f"  Renta mensual: ${row['monthly_rent']:,.2f}",
+        f"  Meses transcurridos en {current_year}: {current_month}",
+        f"  Meses pagados en {current_year}: {row['paid_months']:.2f}",
+        f"  Monto pagado en {current_year}: ${row['paid_amount']:,.2f}",
+        f"  Debió pagar a la fecha: ${row['expected_due']:,.2f}",
+    ]
+    if row["debt"] > 0:
+        lines.append(f"  * Adeudo actual: ${row['debt']:,.2f}")
+    if row["credit"] > 0:
+        lines.append(f"  * Saldo a favor: ${row['credit']:,.2f}")
+    lines.append("")
+    return "\n".join(lines)
+
+
+def write_summaries(stream: TextIO, contracts: Iterable[BaseContract],
+                    current_year: int, current_month: int,
+                    report_format: str = "texto", chunk_size: int = 1000) -> int:
+    """
+    Escribe el resumen de cada contrato en un flujo de texto. Los resúmenes
+    se acumulan en un búfer y se escriben en bloques de chunk_size contratos.
+    
+    Args:
+        stream (TextIO): Flujo de salida
+        contracts (Iterable[BaseContract]): Contratos (puede ser un generador)
+        current_year (int): Año actual
+        current_month (int): Mes actual
+        report_format (str): "texto", "csv" o "json" (un objeto por línea)
+        chunk_size (int): Contratos por escritura
+        
+    Returns:
+        int: Número de contratos escritos
+    """
+    if report_format not in REPORT_FORMATS:
+        raise ValueError(f"Formato de reporte no válido: {report_format}")
+    
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if report_format == "csv" else None
+    if writer is not None:
+        writer.writerow(REPORT_FIELDS)
+    
+    written = 0
+    for contract in contracts:
+        row = contract_summary_row(contract, current_month, current_year)
+        if report_format == "texto":
+            buffer.write(format_contract_summary(row, current_year, current_month))
+        elif writer is not None:
+            writer.writerow([row[field] for field in REPORT_FIELDS])
+        else:
+            buffer.write(json.dumps(row, ensure_ascii=False))
+            buffer.write("\n")
+        written += 1
+        
+        if written % chunk_size == 0:
+            stream.write(buffer.getvalue())
+            buffer.seek(0)
+            buffer.truncate()
+    
+    stream.write(buffer.getvalue())
+    return written
+
 
+class BuildingStatistics(NamedTuple):
+    """
+    Agregados del edificio calculados en un solo recorrido de los contratos.
+    """
+    contracts: int
+    total_collected: float
+    contracts_with_debt: int
+    contracts_with_credit: int
+    contracts_up_to_date: int
+    total_debt: float
+    total_credit: float
 
-class StandardContract(BaseContract):
+
+class StatisticsAccumulator:
     """
-    Contrato estándar para periodos 2024-2025.
-    La renta mensual se fija automáticamente según el número de recámaras.
+    Acumula las estadísticas del edificio contrato por contrato. Permite
+    sumar y restar aportaciones, por lo que sirve tanto para recorridos en
+    streaming como para la caché incremental de BuildingManager. Los montos
+    se acumulan en centavos enteros, así que sumar y restar no deja residuos.
     """
     
-    def __init__(self, tenant_name: str, unit_code: str, start_month: int, 
-                 start_year: int, bedrooms: int):
+    def __init__(self, current_month: int, current_year: Optional[int] = None):
         """
-        Inicializa un contrato estándar.
+        Inicializa los acumuladores en cero.
         
         Args:
-            tenant_name (str): Nombre del inquilino
-            unit_code (str): Código del departamento
-            start_month (int): Mes de inicio del contrato
-            start_year (int): Año de inicio del contrato
-            bedrooms (int): Número de recámaras (3 o 4)
-        """
-        # Establecer renta según número de recámaras
-        if bedrooms == 3:
-            monthly_rent = 7500.0
-        elif bedrooms == 4:
-            monthly_rent = 8500.0
-        else:
-            raise ValueError("Los departamentos solo pueden ser de 3 o 4 recámaras")
+            current_month (int): Mes actual con el que se calculan los balances
+            current_year (Optional[int]): Año actual (para el programa de rentas)
+        """
+        self.current_month = current_month
+        self.current_year = current_year
+        self.contracts = 0
+        self.total_collected_cents = 0
+        self.contracts_with_debt = 0
+        self.contracts_with_credit = 0
+        self.total_debt_cents = 0
+        self.total_credit_cents = 0
+    
+    def add(self, contract: BaseContract, paid_cents: Optional[int] = None,
+            sign: int = 1):
+        """
+        Suma (sign=1) o resta (sign=-1) la aportación de un contrato.
         
-        super().__init__(tenant_name, unit_code, start_month, start_year, monthly_rent)
-        self.bedrooms = bedrooms
+        Args:
+            contract (BaseContract): Contrato
+            paid_cents (Optional[int]): Monto pagado a considerar, en centavos
+                (por defecto, el monto actual del contrato)
+            sign (int): 1 para sumar, -1 para restar
+        """
+        if paid_cents is None:
+            paid_cents = contract.paid_cents
+        self.contracts += sign
+        self.total_collected_cents += sign * paid_cents
+        difference = paid_cents - contract.expected_due_cents(self.current_month, self.current_year)
+        if difference < 0:
+            self.contracts_with_debt += sign
+            self.total_debt_cents -= sign * difference
+        elif difference > 0:
+            self.contracts_with_credit += sign
+            self.total_credit_cents += sign * difference
     
-    def get_contract_type(self) -> str:
+    def result(self) -> BuildingStatistics:
         """
-        Retorna el tipo de contrato.
+        Obtiene las estadísticas acumuladas.
         
         Returns:
-            str: Tipo de contrato
+            BuildingStatistics: Agregados acumulados hasta el momento
         """
-        return f"Estándar 2024-2025 ({self.bedrooms} recámaras)"
+        return BuildingStatistics(
+            contracts=self.contracts,
+            total_collected=from_cents(self.total_collected_cents),
+            contracts_with_debt=self.contracts_with_debt,
+            contracts_with_credit=self.contracts_with_credit,
+            contracts_up_to_date=self.contracts - self.contracts_with_debt - self.contracts_with_credit,
+            total_debt=from_cents(self.total_debt_cents),
+            total_credit=from_cents(self.total_credit_cents),
+        )
 
 
-class HistoricContract(BaseContract):
+class DelinquencyIndex:
     """
-    Contrato histórico (anterior a 2024 o posterior a 2025).
-    La renta mensual es ingresada manualmente por el usuario.
+    Índice de morosidad: ordena los contratos con adeudo por monto y por
+    meses adeudados usando montículos (heapq).
+    
+    Cada cambio de pagos agrega una entrada nueva y la anterior queda
+    obsoleta (se descarta al encontrarla), así que actualizar cuesta
+    O(log n) y las consultas de los K mayores o de un umbral solo recorren
+    los contratos que regresan, sin ordenar todo el edificio.
     """
     
-    def __init__(self, tenant_name: str, unit_code: str, start_month: int, 
-                 start_year: int, monthly_rent: float):
+    def __init__(self, current_month: int, current_year: Optional[int] = None):
         """
-        Inicializa un contrato histórico.
+        Inicializa el índice vacío.
         
         Args:
-            tenant_name (str): Nombre del inquilino
-            unit_code (str): Código del departamento
-            start_month (int): Mes de inicio del contrato
-            start_year (int): Año de inicio del contrato
-            monthly_rent (float): Renta mensual del contrato original
+            current_month (int): Mes actual con el que se calculan los adeudos
+            current_year (Optional[int]): Año actual (para el programa de rentas)
         """
-        super().__init__(tenant_name, unit_code, start_month, start_year, monthly_rent)
+        self.current_month = current_month
+        self.current_year = current_year
+        # (-adeudo_centavos, versión, contrato) y (-meses_adeudados, versión, contrato)
+        self._by_debt: List[Tuple[int, int, BaseContract]] = []
+        self._by_months: List[Tuple[float, int, BaseContract]] = []
+        # Versión vigente de cada contrato con adeudo (por id del contrato)
+        self._current: Dict[int, int] = {}
+        self._version = 0
+    
+    def __len__(self) -> int:
+        return len(self._current)
     
-    def get_contract_type(self) -> str:
+    def months_owed(self, contract: BaseContract, debt_cents: int) -> float:
         """
-        Retorna el tipo de contrato.
+        Convierte un adeudo en meses de renta (con la renta vigente al mes actual).
         
+        Args:
+            contract (BaseContract): Contrato
+            debt_cents (int): Adeudo en centavos
+            
         Returns:
-            str: Tipo de contrato
+            float: Meses de renta adeudados
+        """
+        rent_cents = contract.rent_cents_at(self.current_month, self.current_year)
+        return debt_cents / rent_cents if rent_cents > 0 else 0.0
+    
+    def update(self, contract: BaseContract):
+        """
+        Agrega un contrato o actualiza su posición tras un cambio de pagos.
+        
+        Args:
+            contract (BaseContract): Contrato a indexar
+        """
+        debt_cents = contract.balance_cents(self.current_month, self.current_year)[0]
+        if debt_cents == 0:
+            # Sus entradas anteriores quedan obsoletas
+            self._current.pop(id(contract), None)
+            return
+        
+        self._version += 1
+        self._current[id(contract)] = self._version
+        heapq.heappush(self._by_debt, (-debt_cents, self._version, contract))
+        heapq.heappush(self._by_months, (-self.months_owed(contract, debt_cents),
+                                         self._version, contract))
+        if len(self._by_debt) > 2 * len(self._current) + 1024:
+            self._compact()
+    
+    def _compact(self):
+        """
+        Elimina las entradas obsoletas de los montículos.
+        """
+        for heap in (self._by_debt, self._by_months):
+            heap[:] = [entry for entry in heap
+                       if self._current.get(id(entry[2])) == entry[1]]
+            heapq.heapify(heap)
+    
+    def _pop_while(self, heap: List[Tuple],
+                   keep: Callable[[Tuple, List[Tuple]], bool]) -> List[Tuple]:
+        """
+        Saca del montículo las entradas vigentes mientras keep(entrada) sea
+        verdadero, descartando las obsoletas, y regresa las vigentes al
+        montículo.
+        
+        Args:
+            heap (List[Tuple]): Montículo a consultar
+            keep (Callable[[Tuple, List[Tuple]], bool]): Condición para seguir
+                sacando (recibe la entrada vigente y los resultados hasta ahora)
+            
+        Returns:
+            List[Tuple]: Entradas vigentes, de mayor a menor
+        """
+        results: List[Tuple] = []
+        while heap:
+            entry = heap[0]
+            if self._current.get(id(entry[2])) != entry[1]:
+                heapq.heappop(heap)  # Entrada obsoleta
+                continue
+            if not keep(entry, results):
+                break
+            results.append(heapq.heappop(heap))
+        for entry in results:
+            heapq.heappush(heap, entry)
+        return results
+    
+    def top_debtors(self, k: int) -> List[Tuple[BaseContract, float]]:
+        """
+        Obtiene los K contratos con mayor adeudo.
+        
+        Args:
+            k (int): Número de contratos
+            
+        Returns:
+            List[Tuple[BaseContract, float]]: (contrato, adeudo), de mayor a menor
+        """
+        entries = self._pop_while(self._by_debt, lambda entry, results: len(results) < k)
+        return [(contract, from_cents(-debt_cents)) for debt_cents, _, contract in entries]
+    
+    def owing_more_than(self, months: float) -> List[Tuple[BaseContract, float]]:
         """
-        return f"Histórico ({self.start_year})"
+        Obtiene los contratos que adeudan más de N meses de renta.
+        
+        Args:
+            months (float): Umbral de meses adeudados (excluyente)
+            
+        Returns:
+            List[Tuple[BaseContract, float]]: (contrato, meses_adeudados), de
+            mayor a menor
+        """
+        entries = self._pop_while(self._by_months, lambda entry, results: -entry[0] > months)
+        return [(contract, -months_owed) for months_owed, _, contract in entries]
 
 
 class BuildingManager:
@@ -204,15 +533,336 @@ class BuildingManager:
         self.current_year = current_year
         self.current_month = current_month
         self.contracts: List[BaseContract] = []
+        
+        # Índices de búsqueda, mantenidos por add_contract
+        self._by_unit: Dict[str, List[BaseContract]] = {}
+        self._by_tenant: Dict[str, List[BaseContract]] = {}
+        # (año, mes, posición en self.contracts); se ordena al consultarse
+        self._by_start: List[Tuple[int, int, int]] = []
+        self._by_start_sorted = True
+        
+        # Agregados en caché; se actualizan con cada contrato o pago y se
+        # recalculan completos solo si cambia el año o mes actual (None = inválidos)
+        self._aggregates: Optional[StatisticsAccumulator] = StatisticsAccumulator(current_month,
+                                                                                  current_year)
+        # Índice de morosidad; se construye en la primera consulta y después
+        # se mantiene con cada contrato o pago (None = sin construir)
+        self._delinquency: Optional[DelinquencyIndex] = None
+        
+        # Modo perezoso: padrón con contratos aún sin construir y las
+        # referencias ya construidas (ver attach_roster)
+        self._roster: Optional[ContractRoster] = None
+        self._hydrated: set = set()
+    
+    def _aggregates_valid(self) -> bool:
+        """
+        Indica si los agregados en caché corresponden al año y mes actuales.
+        """
+        return (self._aggregates is not None
+                and self._aggregates.current_month == self.current_month
+                and self._aggregates.current_year == self.current_year)
+    
+    def _on_payment_change(self, contract: BaseContract, previous_cents: int):
+        """
+        Actualiza los agregados cuando cambian los pagos de un contrato.
+        
+        Args:
+            contract (BaseContract): Contrato modificado
+            previous_cents (int): Monto pagado antes del cambio, en centavos
+        """
+        if self._delinquency_valid():
+            self._delinquency.update(contract)
+        if not self._aggregates_valid():
+            return  # Se recalcularán completos en la siguiente consulta
+        self._aggregates.add(contract, previous_cents, -1)
+        self._aggregates.add(contract)
+    
+    def invalidate_cache(self):
+        """
+        Descarta los agregados y el índice de morosidad en caché para
+        recalcularlos en la siguiente consulta (ej. si se modificó la renta
+        de un contrato).
+        """
+        self._aggregates = None
+        self._delinquency = None
+    
+    def _refresh_aggregates(self) -> StatisticsAccumulator:
+        """
+        Recalcula los agregados en un solo recorrido si la caché no
+        corresponde al año y mes actuales.
+        
+        Returns:
+            StatisticsAccumulator: Agregados vigentes
+        """
+        self.hydrate_all()
+        if not self._aggregates_valid():
+            aggregates = StatisticsAccumulator(self.current_month, self.current_year)
+            for contract in self.contracts:
+                aggregates.add(contract)
+            self._aggregates = aggregates
+        return self._aggregates
+    
+    def _delinquency_valid(self) -> bool:
+        """
+        Indica si el índice de morosidad corresponde al año y mes actuales.
+        """
+        return (self._delinquency is not None
+                and self._delinquency.current_month == self.current_month
+                and self._delinquency.current_year == self.current_year)
+    
+    def _refresh_delinquency(self) -> DelinquencyIndex:
+        """
+        Construye el índice de morosidad si no existe o no corresponde al
+        año y mes actuales.
+        
+        Returns:
+            DelinquencyIndex: Índice vigente
+        """
+        self.hydrate_all()
+        if not self._delinquency_valid():
+            index = DelinquencyIndex(self.current_month, self.current_year)
+            for contract in self.contracts:
+                index.update(contract)
+            self._delinquency = index
+        return self._delinquency
     
     def add_contract(self, contract: BaseContract):
         """
-        Agrega un contrato a la lista de contratos administrados.
+        Agrega un contrato a la lista de contratos administrados y
+        actualiza los índices por departamento, inquilino y fecha de inicio.
         
         Args:
             contract (BaseContract): Contrato a agregar
         """
+        key = (contract.start_year, contract.start_month, len(self.contracts))
         self.contracts.append(contract)
+        
+        self._by_unit.setdefault(contract.unit_code, []).append(contract)
+        self._by_tenant.setdefault(contract.tenant_name, []).append(contract)
+        if self._by_start and key < self._by_start[-1]:
+            self._by_start_sorted = False
+        self._by_start.append(key)
+        
+        contract._listener = self._on_payment_change
+        if self._aggregates_valid():
+            self._aggregates.add(contract)
+        if self._delinquency_valid():
+            self._delinquency.update(contract)
+    
+    def attach_roster(self, roster: ContractRoster):
+        """
+        Activa el modo perezoso: los contratos del padrón se construyen
+        hasta que se consultan (por departamento) o hasta que una operación
+        necesita todos (estadísticas, reportes, morosos).
+        
+        Args:
+            roster (ContractRoster): Padrón de contratos sin construir
+        """
+        self.hydrate_all()
+        self._roster = roster
+        self._hydrated = set()
+    
+    def _hydrate(self, refs: Iterable[int]) -> int:
+        """
+        Construye y agrega los contratos del padrón que aún no se han
+        construido.
+        """
+        hydrated = 0
+        for ref in refs:
+            if ref not in self._hydrated:
+                self._hydrated.add(ref)
+                self.add_contract(self._roster.load(ref))
+                hydrated += 1
+        return hydrated
+    
+    def hydrate_all(self) -> int:
+        """
+        Construye todos los contratos pendientes del padrón y sale del modo
+        perezoso.
+        
+        Returns:
+            int: Número de contratos construidos
+        """
+        if self._roster is None:
+            return 0
+        hydrated = self._hydrate(self._roster.refs())
+        self._roster = None
+        self._hydrated = set()
+        return hydrated
+    
+    def find_by_unit(self, unit_code: str) -> List[BaseContract]:
+        """
+        Busca los contratos de un departamento (ej. D202). En modo perezoso
+        construye solo los contratos de ese departamento.
+        
+        Args:
+            unit_code (str): Código del departamento
+            
+        Returns:
+            List[BaseContract]: Contratos del departamento (vacía si no hay)
+        """
+        if self._roster is not None:
+            self._hydrate(self._roster.refs_for(unit_code))
+        return list(self._by_unit.get(unit_code, ()))
+    
+    def find_by_tenant(self, tenant_name: str) -> List[BaseContract]:
+        """
+        Busca los contratos de un inquilino.
+        
+        Args:
+            tenant_name (str): Nombre del inquilino
+            
+        Returns:
+            List[BaseContract]: Contratos del inquilino (vacía si no hay)
+        """
+        self.hydrate_all()
+        return list(self._by_tenant.get(tenant_name, ()))
+    
+    def find_by_start(self, from_year: int, from_month: int,
+                      to_year: int, to_month: int) -> List[BaseContract]:
+        """
+        Busca los contratos iniciados en el rango [desde, hasta), ordenados
+        por fecha de inicio.
+        
+        Args:
+            from_year (int): Año inicial (incluyente)
+            from_month (int): Mes inicial (incluyente)
+            to_year (int): Año final (excluyente)
+            to_month (int): Mes final (excluyente)
+            
+        Returns:
+            List[BaseContract]: Contratos iniciados en el rango
+        """
+        self.hydrate_all()
+        if not self._by_start_sorted:
+            self._by_start.sort()
+            self._by_start_sorted = True
+        
+        low = bisect.bisect_left(self._by_start, (from_year, from_month, -1))
+        high = bisect.bisect_left(self._by_start, (to_year, to_month, -1))
+        return [self.contracts[position] for _, _, position in self._by_start[low:high]]
+    
+    def find_started_before(self, year: int, month: int = 1) -> List[BaseContract]:
+        """
+        Busca los contratos iniciados antes de una fecha
+        (ej. find_started_before(2024) = todos los anteriores a 2024).
+        
+        Args:
+            year (int): Año límite
+            month (int): Mes límite (por defecto enero)
+            
+        Returns:
+            List[BaseContract]: Contratos iniciados antes de la fecha
+        """
+        return self.find_by_start(0, 0, year, month)
+    
+    def top_debtors(self, k: int = 50) -> List[Tuple[BaseContract, float]]:
+        """
+        Obtiene los K contratos con mayor adeudo al mes actual.
+        
+        Args:
+            k (int): Número de contratos
+            
+        Returns:
+            List[Tuple[BaseContract, float]]: (contrato, adeudo), de mayor a menor
+        """
+        return self._refresh_delinquency().top_debtors(k)
+    
+    def contracts_owing_more_than(self, months: float) -> List[Tuple[BaseContract, float]]:
+        """
+        Obtiene los contratos que adeudan más de N meses de renta al mes actual.
+        
+        Args:
+            months (float): Umbral de meses adeudados (excluyente)
+            
+        Returns:
+            List[Tuple[BaseContract, float]]: (contrato, meses_adeudados), de
+            mayor a menor
+        """
+        return self._refresh_delinquency().owing_more_than(months)
+    
+    def display_top_debtors(self, k: int = 50):
+        """
+        Muestra los K contratos con mayor adeudo.
+        
+        Args:
+            k (int): Número de contratos
+        """
+        print_top_debtors([(None, contract, debt) for contract, debt in self.top_debtors(k)])
+    
+    def load_contracts(self, path: str) -> int:
+        """
+        Carga contratos en lote desde un archivo CSV o JSONL, sin captura
+        interactiva. El archivo se procesa registro por registro.
+        
+        Args:
+            path (str): Ruta del archivo de contratos
+            
+        Returns:
+            int: Número de contratos cargados
+        """
+        loaded = 0
+        for contract in iter_contracts(path):
+            self.add_contract(contract)
+            loaded += 1
+        return loaded
+    
+    def load_from_repository(self, repository: ContractRepository) -> int:
+        """
+        Carga desde la base de datos los contratos del año actual.
+        
+        Args:
+            repository (ContractRepository): Repositorio de contratos
+            
+        Returns:
+            int: Número de contratos cargados
+        """
+        loaded = 0
+        for contract in repository.iter_contracts(self.current_year):
+            self.add_contract(contract)
+            loaded += 1
+        return loaded
+    
+    def save_to_repository(self, repository: ContractRepository) -> int:
+        """
+        Guarda los contratos y sus pagos del año actual en la base de datos.
+        
+        Args:
+            repository (ContractRepository): Repositorio de contratos
+            
+        Returns:
+            int: Número de contratos guardados
+        """
+        self.hydrate_all()
+        return repository.upsert_contracts(self.contracts, self.current_year)
+    
+    def save_snapshot(self, path: str) -> int:
+        """
+        Guarda los contratos en un snapshot binario.
+        
+        Args:
+            path (str): Ruta del snapshot
+            
+        Returns:
+            int: Número de contratos guardados
+        """
+        self.hydrate_all()
+        return ContractSnapshot.write(path, self.contracts)
+    
+    def load_snapshot(self, path: str) -> int:
+        """
+        Carga todos los contratos de un snapshot binario.
+        
+        Args:
+            path (str): Ruta del snapshot
+            
+        Returns:
+            int: Número de contratos cargados
+        """
+        with ContractSnapshot(path) as snapshot:
+            for index in range(len(snapshot)):
+                self.add_contract(snapshot.contract(index))
+            return len(snapshot)
     
     def create_contract_interactive(self) -> BaseContract:
         """
@@ -260,7 +910,7 @@ class BuildingManager:
         
         # Decidir tipo de contrato según el año
         if 2024 <= contract_year <= 2025:
-            contract = StandardContract(tenant_name, unit_code, contract_month, 
+            contract = build_contract(tenant_name, unit_code, contract_month,
                                       contract_year, bedrooms)
             print(f"Contrato estándar 2024-2025. Renta mensual: ${contract.monthly_rent:,.2f}")
         else:
@@ -275,8 +925,8 @@ class BuildingManager:
                 except ValueError:
                     print("Error: Ingrese un monto válido.")
             
-            contract = HistoricContract(tenant_name, unit_code, contract_month, 
-                                      contract_year, monthly_rent)
+            contract = build_contract(tenant_name, unit_code, contract_month,
+                                      contract_year, bedrooms, monthly_rent)
         
         # Captura de pagos
         print(f"\nCaptura de pagos en {self.current_year}:")
@@ -306,6 +956,31 @@ class BuildingManager:
         
         return contract
     
+    def contract_summary_row(self, contract: BaseContract) -> Dict[str, object]:
+        """
+        Obtiene los datos del resumen de un contrato al mes actual.
+        
+        Args:
+            contract (BaseContract): Contrato a resumir
+            
+        Returns:
+            Dict[str, object]: Valores con las llaves de REPORT_FIELDS
+        """
+        return contract_summary_row(contract, self.current_month, self.current_year)
+    
+    def format_contract_summary(self, contract: BaseContract) -> str:
+        """
+        Construye el texto del resumen de un contrato.
+        
+        Args:
+            contract (BaseContract): Contrato a resumir
+            
+        Returns:
+            str: Resumen con salto de línea final
+        """
+        return format_contract_summary(self.contract_summary_row(contract),
+                                       self.current_year, self.current_month)
+    
     def display_contract_summary(self, contract: BaseContract):
         """
         Muestra el resumen de un contrato específico.
@@ -313,22 +988,41 @@ class BuildingManager:
         Args:
             contract (BaseContract): Contrato a mostrar
         """
-        paid_months, paid_amount = contract.get_payment_info()
-        adeudo, saldo_favor = contract.balance(self.current_month)
-        expected_amount = contract.expected_due(self.current_month)
+        sys.stdout.write(self.format_contract_summary(contract))
+    
+    def display_unit_summary(self, unit_code: str) -> bool:
+        """
+        Muestra el resumen de los contratos de un departamento. En modo
+        perezoso solo se construyen los contratos de ese departamento.
         
-        print(f"\nResumen de {contract.tenant_name} (Depto: {contract.unit_code})")
-        print(f"  Tipo de contrato: {contract.get_contract_type()}")
-        print(f"  Renta mensual: ${contract.monthly_rent:,.2f}")
-        print(f"  Meses transcurridos en {self.current_year}: {self.current_month}")
-        print(f"  Meses pagados en {self.current_year}: {paid_months:.2f}")
-        print(f"  Monto pagado en {self.current_year}: ${paid_amount:,.2f}")
-        print(f"  Debió pagar a la fecha: ${expected_amount:,.2f}")
+        Args:
+            unit_code (str): Código del departamento
+            
+        Returns:
+            bool: False si el departamento no tiene contratos
+        """
+        contracts = self.find_by_unit(unit_code)
+        for contract in contracts:
+            self.display_contract_summary(contract)
+        return bool(contracts)
+    
+    def write_report(self, stream: TextIO, report_format: str = "texto",
+                     chunk_size: int = 1000) -> int:
+        """
+        Escribe el resumen de todos los contratos en un flujo de texto
+        (pantalla, archivo o gzip).
         
-        if adeudo > 0:
-            print(f"  * Adeudo actual: ${adeudo:,.2f}")
-        if saldo_favor > 0:
-            print(f"  * Saldo a favor: ${saldo_favor:,.2f}")
+        Args:
+            stream (TextIO): Flujo de salida
+            report_format (str): "texto", "csv" o "json" (un objeto por línea)
+            chunk_size (int): Contratos por escritura
+            
+        Returns:
+            int: Número de contratos escritos
+        """
+        self.hydrate_all()
+        return write_summaries(stream, self.contracts, self.current_year,
+                               self.current_month, report_format, chunk_size)
     
     def calculate_building_total(self) -> float:
         """
@@ -337,11 +1031,9 @@ class BuildingManager:
         Returns:
             float: Total cobrado en el año
         """
-        total = 0.0
-        for contract in self.contracts:
-            _, paid_amount = contract.get_payment_info()
-            total += paid_amount
-        return total
+        # La caché deja de actualizarse si cambia el año o mes actual, así
+        # que se recalcula igual que en calculate_statistics
+        return from_cents(self._refresh_aggregates().total_collected_cents)
     
     def run_building_management(self):
         """
@@ -369,43 +1061,602 @@ class BuildingManager:
             self.add_contract(contract)
             self.display_contract_summary(contract)
         
-        # Mostrar totales del edificio
-        total_collected = self.calculate_building_total()
-        print(f"\n{'='*45}")
-        print(f"TOTAL COBRADO EN {self.current_year}: ${total_collected:,.2f}")
-        print(f"{'='*45}")
+        self.display_building_statistics()
+    
+    def run_batch_close(self, path: Optional[str], show_summaries: bool = False,
+                        report_path: Optional[str] = None,
+                        report_format: str = "texto",
+                        repository: Optional[ContractRepository] = None):
+        """
+        Ejecuta el cierre del edificio cargando los contratos desde archivo
+        o, si no hay archivo, desde la base de datos.
+        
+        Args:
+            path (Optional[str]): Ruta del archivo CSV o JSONL de contratos
+            show_summaries (bool): Si es True, muestra el resumen de cada contrato
+            report_path (Optional[str]): Archivo donde escribir los resúmenes
+            report_format (str): Formato del reporte ("texto", "csv" o "json")
+            repository (Optional[ContractRepository]): Base de datos donde
+                guardar los contratos del archivo (o de donde leerlos)
+        """
+        print("Sistema de Control de Contratos de Renta (modo lote)")
+        print("======================================")
+        print(f"Año actual: {self.current_year}")
+        print(f"Mes actual: {self.current_month}")
+        
+        if path:
+            loaded = self.load_contracts(path)
+            print(f"\nContratos cargados desde {path}: {loaded}")
+            if repository is not None:
+                saved = self.save_to_repository(repository)
+                print(f"Contratos guardados en {repository.path}: {saved}")
+        else:
+            loaded = self.load_from_repository(repository)
+            print(f"\nContratos cargados desde {repository.path}: {loaded}")
+        
+        if report_path:
+            with open_report(report_path) as report:
+                written = self.write_report(report, report_format)
+            print(f"Reporte de {written} contratos escrito en {report_path}")
+        elif show_summaries:
+            self.write_report(sys.stdout, report_format)
+        
+        self.display_building_statistics()
+    
+    def calculate_statistics(self) -> "BuildingStatistics":
+        """
+        Obtiene el total cobrado y las estadísticas de adeudo/saldo a favor.
+        
+        Los agregados se mantienen al agregar contratos o registrar pagos;
+        solo se recorren todos los contratos (una vez, calculando un balance
+        por contrato) si cambió el año o mes actual o se invalidó la caché.
+        
+        Returns:
+            BuildingStatistics: Agregados del edificio al mes actual
+        """
+        return self._refresh_aggregates().result()
+    
+    def display_building_statistics(self):
+        """
+        Muestra el total cobrado y las estadísticas de los contratos registrados.
+        """
+        print_statistics(self.calculate_statistics(), self.current_year)
+
+
+def print_statistics(stats: BuildingStatistics, current_year: int):
+    """
+    Muestra el total cobrado y las estadísticas de un edificio.
+    
+    Args:
+        stats (BuildingStatistics): Estadísticas a mostrar
+        current_year (int): Año actual
+    """
+    # Mostrar totales del edificio
+    print(f"\n{'='*45}")
+    print(f"TOTAL COBRADO EN {current_year}: ${stats.total_collected:,.2f}")
+    print(f"{'='*45}")
+    
+    # Estadísticas adicionales
+    print(f"\nEstadísticas del edificio:")
+    print(f"  Contratos registrados: {stats.contracts}")
+    print(f"  Contratos con adeudo: {stats.contracts_with_debt}")
+    print(f"  Contratos con saldo a favor: {stats.contracts_with_credit}")
+    print(f"  Contratos al corriente: {stats.contracts_up_to_date}")
+    print(f"  Adeudo total: ${stats.total_debt:,.2f}")
+    print(f"  Saldo a favor total: ${stats.total_credit:,.2f}")
+
+
+def print_top_debtors(debtors: List[Tuple[Optional[str], BaseContract, float]]):
+    """
+    Muestra una lista de morosos.
+    
+    Args:
+        debtors (List[Tuple[Optional[str], BaseContract, float]]): Tercias
+            (edificio o None, contrato, adeudo), de mayor a menor adeudo
+    """
+    lines = [f"\nMayores adeudos ({len(debtors)}):"]
+    for position, (building, contract, debt) in enumerate(debtors, 1):
+        where = f"{building}/" if building else ""
+        lines.append(f"  {position:>3}. {where}{contract.unit_code} {contract.tenant_name}: "
+                     f"${debt:,.2f}")
+    print("\n".join(lines))
+
+
+def merge_statistics(statistics: Iterable[BuildingStatistics]) -> BuildingStatistics:
+    """
+    Combina las estadísticas de varios edificios en un solo agregado.
+    
+    Args:
+        statistics (Iterable[BuildingStatistics]): Estadísticas por edificio
+        
+    Returns:
+        BuildingStatistics: Suma campo por campo (los montos, en centavos)
+    """
+    money = {"total_collected", "total_debt", "total_credit"}
+    totals = [0] * len(BuildingStatistics._fields)
+    for stats in statistics:
+        for position, (field, value) in enumerate(zip(BuildingStatistics._fields, stats)):
+            totals[position] += to_cents(value) if field in money else value
+    return BuildingStatistics(*(from_cents(total) if field in money else total
+                                for field, total in zip(BuildingStatistics._fields, totals)))
+
+
+def _close_files(shard: List[Tuple[str, str]], current_year: int, current_month: int,
+                 top_k: int = 0) -> List[Tuple[str, BuildingStatistics, List[Tuple[BaseContract, float]]]]:
+    """
+    Carga y cierra un grupo de edificios a partir de sus archivos (se
+    ejecuta en un proceso del pool, así que solo viajan las rutas y los
+    resultados).
+    
+    Sin top_k cada archivo se cierra en streaming, sin guardar los contratos;
+    con top_k se carga el edificio completo para obtener sus mayores adeudos.
+    
+    Args:
+        shard (List[Tuple[str, str]]): Pares (nombre, ruta del archivo)
+        current_year (int): Año actual
+        current_month (int): Mes actual (1-12)
+        top_k (int): Mayores adeudos a regresar por edificio (0 = ninguno)
+        
+    Returns:
+        List[Tuple[str, BuildingStatistics, List[Tuple[BaseContract, float]]]]:
+        (nombre, estadísticas, mayores adeudos) por edificio
+    """
+    results = []
+    for name, path in shard:
+        if top_k:
+            manager = BuildingManager(current_year, current_month)
+            manager.load_contracts(path)
+            results.append((name, manager.calculate_statistics(), manager.top_debtors(top_k)))
+        else:
+            results.append((name, stream_month_end_close(path, current_year, current_month), []))
+    return results
+
+
+class PortfolioManager:
+    """
+    Administra un portafolio de edificios y ejecuta el cierre de mes
+    repartiendo los edificios entre varios procesos.
+    """
+    
+    def __init__(self, current_year: int, current_month: int):
+        """
+        Inicializa el portafolio.
+        
+        Args:
+            current_year (int): Año actual
+            current_month (int): Mes actual (1-12)
+        """
+        self.current_year = current_year
+        self.current_month = current_month
+        # Edificios cargados en este proceso
+        self.buildings: Dict[str, BuildingManager] = {}
+        # Edificios registrados por archivo (ver load_directory); se leen en
+        # los procesos del cierre o al consultarse aquí
+        self.paths: Dict[str, str] = {}
+        # Mayores adeudos de los edificios de archivo calculados en el último
+        # cierre, y cuántos se pidieron por edificio
+        self._file_debtors: Dict[str, List[Tuple[BaseContract, float]]] = {}
+        self._file_debtors_k = 0
+    
+    def names(self) -> List[str]:
+        """
+        Obtiene los nombres de los edificios: primero los registrados por
+        archivo y después los agregados con add_building.
         
-        # Estadísticas adicionales
-        print(f"\nEstadísticas del edificio:")
-        print(f"  Contratos registrados: {len(self.contracts)}")
+        Returns:
+            List[str]: Nombres de los edificios
+        """
+        return list(self.paths) + [name for name in self.buildings if name not in self.paths]
+    
+    def add_building(self, name: str) -> BuildingManager:
+        """
+        Crea (o regresa, si ya existe) el administrador de un edificio. Un
+        edificio registrado por archivo se carga en este proceso.
+        
+        Args:
+            name (str): Nombre o clave del edificio
+            
+        Returns:
+            BuildingManager: Administrador del edificio
+        """
+        if name not in self.buildings:
+            manager = BuildingManager(self.current_year, self.current_month)
+            if name in self.paths:
+                manager.load_contracts(self.paths[name])
+            self.buildings[name] = manager
+        return self.buildings[name]
+    
+    def load_directory(self, directory: str) -> int:
+        """
+        Registra un edificio por cada archivo CSV/JSONL de un directorio; el
+        nombre del archivo (sin extensión) es el nombre del edificio.
         
-        contracts_with_debt = sum(1 for contract in self.contracts 
-                                if contract.balance(self.current_month)[0] > 0)
-        contracts_with_credit = sum(1 for contract in self.contracts 
-                                  if contract.balance(self.current_month)[1] > 0)
+        Los archivos no se leen aquí: close_month los reparte entre los
+        procesos, que cargan y cierran cada edificio.
         
-        print(f"  Contratos con adeudo: {contracts_with_debt}")
-        print(f"  Contratos con saldo a favor: {contracts_with_credit}")
-        print(f"  Contratos al corriente: {len(self.contracts) - contracts_with_debt - contracts_with_credit}")
+        Args:
+            directory (str): Directorio con los archivos de contratos
+            
+        Returns:
+            int: Número de edificios registrados
+        """
+        registered = 0
+        for path in sorted(Path(directory).iterdir()):
+            if path.suffix.lower() in (".csv", ".jsonl", ".json"):
+                self.paths[path.stem] = str(path)
+                registered += 1
+        return registered
+    
+    def close_month(self, max_workers: Optional[int] = None,
+                    top_k: int = 0) -> Dict[str, BuildingStatistics]:
+        """
+        Calcula las estadísticas de todos los edificios.
+        
+        Los edificios registrados por archivo que no se han cargado aquí se
+        reparten en un grupo por proceso: cada proceso recibe solo rutas,
+        carga y cierra sus edificios y regresa las estadísticas. Los
+        edificios ya cargados usan sus agregados en caché, sin enviarse a
+        otro proceso.
+        
+        Args:
+            max_workers (Optional[int]): Procesos a usar (por defecto, núcleos)
+            top_k (int): Mayores adeudos a conservar por edificio de archivo,
+                para top_debtors (0 = ninguno)
+            
+        Returns:
+            Dict[str, BuildingStatistics]: Estadísticas por edificio
+        """
+        results = {name: manager.calculate_statistics()
+                   for name, manager in self.buildings.items()}
+        pending = [(name, path) for name, path in self.paths.items()
+                   if name not in self.buildings]
+        
+        workers = min(max_workers or os.cpu_count() or 1, len(pending))
+        if workers <= 1:
+            closed = _close_files(pending, self.current_year, self.current_month, top_k)
+        else:
+            shards = [pending[position::workers] for position in range(workers)]
+            closed = []
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for shard_results in executor.map(_close_files, shards,
+                                                  [self.current_year] * workers,
+                                                  [self.current_month] * workers,
+                                                  [top_k] * workers):
+                    closed.extend(shard_results)
+        
+        self._file_debtors = {}
+        self._file_debtors_k = top_k
+        for name, stats, debtors in closed:
+            results[name] = stats
+            self._file_debtors[name] = debtors
+        return {name: results[name] for name in self.names()}
+    
+    def top_debtors(self, k: int = 50) -> List[Tuple[str, BaseContract, float]]:
+        """
+        Obtiene los K contratos con mayor adeudo de todo el portafolio,
+        combinando los K mayores de cada edificio.
+        
+        Los edificios de archivo usan los adeudos calculados en close_month
+        (si se pidieron al menos K); si no, se cargan en este proceso.
+        
+        Args:
+            k (int): Número de contratos
+            
+        Returns:
+            List[Tuple[str, BaseContract, float]]: (edificio, contrato, adeudo),
+            de mayor a menor
+        """
+        candidates = []
+        for name in self.names():
+            if name not in self.buildings and name in self._file_debtors and k <= self._file_debtors_k:
+                debtors = self._file_debtors[name][:k]
+            else:
+                debtors = self.add_building(name).top_debtors(k)
+            candidates.extend((name, contract, debt) for contract, debt in debtors)
+        return heapq.nlargest(k, candidates, key=lambda item: item[2])
+    
+    def contracts_owing_more_than(self, months: float) -> List[Tuple[str, BaseContract, float]]:
+        """
+        Obtiene los contratos del portafolio que adeudan más de N meses de
+        renta (los edificios de archivo se cargan en este proceso).
+        
+        Args:
+            months (float): Umbral de meses adeudados (excluyente)
+            
+        Returns:
+            List[Tuple[str, BaseContract, float]]: (edificio, contrato,
+            meses_adeudados), de mayor a menor
+        """
+        found = [(name, contract, owed)
+                 for name in self.names()
+                 for contract, owed in self.add_building(name).contracts_owing_more_than(months)]
+        found.sort(key=lambda item: item[2], reverse=True)
+        return found
+    
+    def run_portfolio_close(self, max_workers: Optional[int] = None, top_k: int = 0):
+        """
+        Ejecuta el cierre de mes y muestra los totales por edificio y del
+        portafolio completo.
+        
+        Args:
+            max_workers (Optional[int]): Procesos a usar (por defecto, núcleos)
+            top_k (int): Mayores adeudos a calcular en el cierre (ver close_month)
+        """
+        per_building = self.close_month(max_workers, top_k)
+        
+        print(f"\nCierre del portafolio {self.current_month}/{self.current_year}")
+        print(f"{'-'*45}")
+        for name, stats in per_building.items():
+            print(f"  {name}: {stats.contracts} contratos, cobrado ${stats.total_collected:,.2f}, "
+                  f"adeudo ${stats.total_debt:,.2f}")
+        
+        portfolio = merge_statistics(per_building.values())
+        print(f"\n{'='*45}")
+        print(f"TOTAL COBRADO EN {self.current_year}: ${portfolio.total_collected:,.2f}")
+        print(f"{'='*45}")
+        print(f"  Edificios: {len(per_building)}")
+        print(f"  Contratos registrados: {portfolio.contracts}")
+        print(f"  Contratos con adeudo: {portfolio.contracts_with_debt}")
+        print(f"  Contratos con saldo a favor: {portfolio.contracts_with_credit}")
+        print(f"  Contratos al corriente: {portfolio.contracts_up_to_date}")
+        print(f"  Adeudo total: ${portfolio.total_debt:,.2f}")
+        print(f"  Saldo a favor total: ${portfolio.total_credit:,.2f}")
 
 
-def validate_month(month: int) -> bool:
+def accumulate(contracts: Iterable[BaseContract],
+               accumulator: StatisticsAccumulator) -> Iterator[BaseContract]:
     """
-    Valida que el mes esté en el rango correcto.
+    Etapa del pipeline que suma cada contrato a las estadísticas y lo deja
+    pasar a la siguiente etapa.
     
     Args:
-        month (int): Mes a validar
+        contracts (Iterable[BaseContract]): Contratos de la etapa anterior
+        accumulator (StatisticsAccumulator): Estadísticas a actualizar
         
+    Yields:
+        BaseContract: El mismo contrato recibido
+    """
+    for contract in contracts:
+        accumulator.add(contract)
+        yield contract
+
+
+def stream_month_end_close(path: str, current_year: int, current_month: int,
+                           stream: Optional[TextIO] = None,
+                           report_format: str = "csv",
+                           chunk_size: int = 1000) -> BuildingStatistics:
+    """
+    Cierra el mes de un archivo de contratos en memoria constante.
+    
+    Cada contrato pasa por el pipeline leer → construir → acumular →
+    escribir resumen y se descarta; nunca se guardan todos en memoria.
+    
+    Args:
+        path (str): Archivo CSV o JSONL de contratos
+        current_year (int): Año actual
+        current_month (int): Mes actual (1-12)
+        stream (Optional[TextIO]): Flujo para los resúmenes (None = no escribir)
+        report_format (str): Formato de los resúmenes ("texto", "csv" o "json")
+        chunk_size (int): Contratos por escritura
+        
+    Returns:
+        BuildingStatistics: Totales del edificio
+    """
+    accumulator = StatisticsAccumulator(current_month, current_year)
+    contracts = accumulate(iter_contracts(path), accumulator)
+    if stream is None:
+        for _ in contracts:
+            pass
+    else:
+        write_summaries(stream, contracts, current_year, current_month,
+                        report_format, chunk_size)
+    return accumulator.result()
+
+
+def run_streaming_close(path: str, current_year: int, current_month: int,
+                        report_path: Optional[str] = None,
+                        report_format: str = "csv"):
+    """
+    Ejecuta el cierre en streaming y muestra los totales del edificio.
+    
+    Args:
+        path (str): Archivo CSV o JSONL de contratos
+        current_year (int): Año actual
+        current_month (int): Mes actual (1-12)
+        report_path (Optional[str]): Archivo donde escribir los resúmenes
+        report_format (str): Formato de los resúmenes
+    """
+    print("Sistema de Control de Contratos de Renta (modo streaming)")
+    print("======================================")
+    print(f"Año actual: {current_year}")
+    print(f"Mes actual: {current_month}")
+    
+    if report_path:
+        with open_report(report_path) as report:
+            stats = stream_month_end_close(path, current_year, current_month,
+                                           report, report_format)
+        print(f"\nReporte de {stats.contracts} contratos escrito en {report_path}")
+    else:
+        stats = stream_month_end_close(path, current_year, current_month)
+    
+    print_statistics(stats, current_year)
+
+
+# Funciones que mide --perfil, como (clase o módulo, nombre)
+PROFILE_TARGETS = (
+    (StandardContract, "__init__"),
+    (HistoricContract, "__init__"),
+    (modelo, "contract_from_record"),
+    (BaseContract, "set_payments"),
+    (BaseContract, "restore_payments"),
+    (BaseContract, "post_payment"),
+    (BaseContract, "infer_months_or_amount"),
+    (BaseContract, "expected_due"),
+    (BaseContract, "expected_due_cents"),
+    (BaseContract, "balance"),
+    (BaseContract, "balance_cents"),
+    (StatisticsAccumulator, "add"),
+    (BuildingManager, "add_contract"),
+    (BuildingManager, "load_contracts"),
+    (BuildingManager, "calculate_building_total"),
+    (BuildingManager, "calculate_statistics"),
+    (BuildingManager, "_refresh_aggregates"),
+    (BuildingManager, "_refresh_delinquency"),
+    (BuildingManager, "top_debtors"),
+    (BuildingManager, "contracts_owing_more_than"),
+    (BuildingManager, "write_report"),
+)
+
+
+def parse_arguments() -> argparse.Namespace:
+    """
+    Lee los argumentos de línea de comandos (todos opcionales).
+    
     Returns:
-        bool: True si el mes es válido
+        argparse.Namespace: Argumentos del programa
     """
-    return 1 <= month <= 12
+    parser = argparse.ArgumentParser(
+        description="Control de pagos de renta de un edificio residencial")
+    parser.add_argument("--archivo",
+                        help="CSV o JSONL de contratos para el modo lote (sin captura)")
+    parser.add_argument("--anio", type=int, help="Año actual (AAAA)")
+    parser.add_argument("--mes", type=int, help="Mes actual (1..12)")
+    parser.add_argument("--resumenes", action="store_true",
+                        help="En modo lote, muestra el resumen de cada contrato")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Procesa --archivo en memoria constante (sin guardar contratos)")
+    parser.add_argument("--db",
+                        help="Base SQLite: guarda los contratos de --archivo o, sin él, los carga")
+    parser.add_argument("--reporte",
+                        help="En modo lote, archivo para los resúmenes (.gz = comprimido)")
+    parser.add_argument("--formato", choices=REPORT_FORMATS, default="texto",
+                        help="Formato de los resúmenes (default: texto)")
+    parser.add_argument("--servicio", type=int, metavar="PUERTO",
+                        help="Inicia el servicio de pagos con los contratos de --archivo/--db")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="Dirección del servicio de pagos (default: 127.0.0.1)")
+    parser.add_argument("--portafolio",
+                        help="Directorio con un archivo de contratos por edificio")
+    parser.add_argument("--procesos", type=int,
+                        help="Procesos para el cierre del portafolio (por defecto, núcleos)")
+    parser.add_argument("--morosos", type=int, metavar="K",
+                        help="En modo lote o portafolio, muestra los K mayores adeudos")
+    parser.add_argument("--departamento", metavar="CLAVE",
+                        help="Muestra solo el resumen de un departamento de --archivo/--db "
+                             "(sin construir los demás contratos)")
+    parser.add_argument("--perfil", metavar="ARCHIVO",
+                        help="Mide las funciones principales y guarda el perfil "
+                             "(.json o formato pstats)")
+    return parser.parse_args()
 
 
 def main():
     """
     Función principal del programa.
     """
+    args = parse_arguments()
+    if not args.perfil:
+        run(args)
+        return
+    
+    with Profiler(PROFILE_TARGETS) as profiler:
+        try:
+            run(args)
+        finally:
+            profiler.write(args.perfil)
+            print(f"Perfil guardado en {args.perfil}", file=sys.stderr)
+
+
+def run_batch(args: argparse.Namespace):
+    """
+    Ejecuta los modos sin captura (lote, streaming, servicio, departamento
+    o portafolio).
+    
+    Args:
+        args (argparse.Namespace): Argumentos de la línea de comandos
+    """
+    if args.anio is None or args.mes is None or not validate_month(args.mes):
+        raise SystemExit("Error: el modo lote requiere --anio y --mes (1..12).")
+    if args.streaming:
+        if not args.archivo:
+            raise SystemExit("Error: --streaming requiere --archivo.")
+        run_streaming_close(args.archivo, args.anio, args.mes,
+                            args.reporte, args.formato)
+        return
+    if args.servicio is not None:
+        if args.portafolio:
+            raise SystemExit("Error: --servicio atiende un solo edificio; no se combina con --portafolio.")
+        if not args.archivo and not args.db:
+            raise SystemExit("Error: --servicio requiere --archivo o --db.")
+        building_manager = BuildingManager(args.anio, args.mes)
+        repository = ContractRepository(args.db) if args.db else None
+        try:
+            if args.archivo:
+                building_manager.load_contracts(args.archivo)
+                if repository is not None:
+                    building_manager.save_to_repository(repository)
+            else:
+                building_manager.load_from_repository(repository)
+            run_payment_service(building_manager, args.host, args.servicio, repository)
+        finally:
+            if repository is not None:
+                repository.close()
+        return
+    if args.departamento:
+        if not args.archivo and not args.db:
+            raise SystemExit("Error: --departamento requiere --archivo o --db.")
+        building_manager = BuildingManager(args.anio, args.mes)
+        if args.archivo:
+            roster = FileRoster(args.archivo)
+            close = roster.close
+        else:
+            repository = ContractRepository(args.db)
+            roster = RepositoryRoster(repository, args.anio)
+            close = repository.close
+        try:
+            building_manager.attach_roster(roster)
+            if not building_manager.display_unit_summary(args.departamento):
+                raise SystemExit(f"Error: no hay contratos del departamento {args.departamento}.")
+        finally:
+            close()
+        return
+    if args.portafolio:
+        portfolio = PortfolioManager(args.anio, args.mes)
+        portfolio.load_directory(args.portafolio)
+        portfolio.run_portfolio_close(args.procesos, args.morosos or 0)
+        if args.morosos:
+            print_top_debtors(portfolio.top_debtors(args.morosos))
+        return
+    building_manager = BuildingManager(args.anio, args.mes)
+    if args.db:
+        with ContractRepository(args.db) as repository:
+            building_manager.run_batch_close(args.archivo, args.resumenes,
+                                             args.reporte, args.formato,
+                                             repository)
+    else:
+        building_manager.run_batch_close(args.archivo, args.resumenes,
+                                         args.reporte, args.formato)
+    if args.morosos:
+        building_manager.display_top_debtors(args.morosos)
+
+
+def run(args: argparse.Namespace):
+    """
+    Ejecuta el modo indicado por los argumentos (lote, streaming, servicio,
+    portafolio o captura interactiva).
+    
+    Args:
+        args (argparse.Namespace): Argumentos de la línea de comandos
+    """
+    # Modo lote: no se solicita nada por teclado
+    if args.archivo or args.portafolio or args.db:
+        try:
+            run_batch(args)
+        except (OSError, ValueError) as error:
+            # Archivo inexistente o con registros inválidos: mensaje, sin traza
+            raise SystemExit(f"Error: {error}") from error
+        return
+    
     print("Programa para controlar pagos de renta (edificio con 16 deptos)")
     print("==============================================================")
     
@@ -31,6 +31,9 @@ Supuestos:
 
 class BaseContract:
     """Clase base para todos los contratos"""
+    # Sin __dict__ por instancia: cada contrato ocupa menos memoria
+    __slots__ = ("tenant_name", "unit_code", "start_month", "start_year", "monthly_rent")
+
     def __init__(self, tenant_name, unit_code, start_month, start_year, monthly_rent):
         self.tenant_name = tenant_name
         self.unit_code = unit_code
@@ -67,6 +70,8 @@ class BaseContract:
 
 class StandardContract(BaseContract):
     """Contrato vigente 2024-2025 con tarifas estándar"""
+    __slots__ = ("bedrooms",)
+
     def __init__(self, tenant_name, unit_code, start_month, start_year, bedrooms):
         # Establecer renta según número de recámaras
         if bedrooms == 3:
@@ -80,6 +85,8 @@ class StandardContract(BaseContract):
 
 class HistoricContract(BaseContract):
     """Contrato histórico con renta personalizada"""
+    __slots__ = ()
+
     def __init__(self, tenant_name, unit_code, start_month, start_year, monthly_rent):
         super().__init__(tenant_name, unit_code, start_month, start_year, monthly_rent)
 
@@ -136,18 +143,21 @@ class BuildingManager:
             expected, debt, favor = contract.balance(self.current_month, amount_paid)
             self.total_building += amount_paid
             
-            # Mostrar resumen
-            print(f"\nResumen de {name} (Depto: {unit})")
-            print(f"  Renta mensual: ${contract.monthly_rent}")
-            print(f"  Meses transcurridos en {self.current_year}: {self.current_month}")
-            print(f"  Meses pagados en {self.current_year}: {months_paid}")
-            print(f"  Monto pagado en {self.current_year}: ${amount_paid}")
-            print(f"  Debió pagar a la fecha: ${expected}")
+            # Mostrar resumen (se arma completo y se imprime una sola vez)
+            summary = [
+                f"\nResumen de {name} (Depto: {unit})",
+                f"  Renta mensual: ${contract.monthly_rent}",
+                f"  Meses transcurridos en {self.current_year}: {self.current_month}",
+                f"  Meses pagados en {self.current_year}: {months_paid}",
+                f"  Monto pagado en {self.current_year}: ${amount_paid}",
+                f"  Debió pagar a la fecha: ${expected}",
+            ]
             
             if debt > 0:
-                print(f"  * Adeudo actual: ${debt}")
+                summary.append(f"  * Adeudo actual: ${debt}")
             if favor > 0:
-                print(f"  * Saldo a favor: ${favor}")
+                summary.append(f"  * Saldo a favor: ${favor}")
+            print("\n".join(summary))
     
     def show_total(self):
         """Muestra el total cobrado del edificio"""
@@ -0,0 +1,368 @@
+"""
+Benchmarks del motor de contratos de renta
+==========================================
+
+Mide el costo de las operaciones principales en las tres versiones del
+proyecto final (original, V1 y V2) sobre un portafolio sintético:
+
+- Construcción de contratos.
+- infer_months_or_amount y balance por contrato.
+- Cierre del edificio: total cobrado y estadísticas de adeudo/saldo
+  (en V2, calculate_building_total y calculate_statistics).
+- Memoria por contrato, con __slots__ contra una subclase con __dict__.
+
+Los resultados se pueden guardar en JSON y compararse contra una corrida
+anterior para detectar regresiones entre versiones.
+
+Uso:
+    python benchmark_contratos.py [--contratos N] [--historicos 0.3]
+                                  [--salida resultados.json]
+                                  [--comparar anterior.json]
+"""
+
+import argparse
+import importlib.util
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Dict, List, Optional
+
+PROJECT_DIR = Path(__file__).resolve().parent
+
+VERSIONS = {
+    "original": "Avance_Proyecto_Final.py",
+    "V1": "Avance_Proyecto Final_V1.py",
+    "V2": "Avance_Proyecto Final_V2.py",
+}
+
+# Mes de corte usado en todos los cálculos de balance
+CURRENT_MONTH = 9
+
+
+def load_version(name: str) -> ModuleType:
+    """
+    Importa una versión del proyecto a partir de su archivo (los nombres
+    tienen espacios, por eso no se pueden importar con `import`).
+
+    Args:
+        name (str): Clave de VERSIONS
+
+    Returns:
+        ModuleType: Módulo cargado
+    """
+    module_name = f"proyecto_{name.lower()}"
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, PROJECT_DIR / VERSIONS[name])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+# =========================
+# Portafolio sintético
+# =========================
+
+def generate_records(count: int, historic_ratio: float = 0.3, seed: int = 2025) -> List[Dict]:
+    """
+    Genera registros de contratos reproducibles (misma semilla = mismos datos),
+    con los mismos campos que acepta el modo lote de V2.
+
+    Args:
+        count (int): Número de contratos
+        historic_ratio (float): Fracción de contratos históricos (0..1)
+        seed (int): Semilla del generador
+
+    Returns:
+        List[Dict]: Un registro por contrato
+    """
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        historic = rng.random() < historic_ratio
+        bedrooms = rng.choice((3, 4))
+        monthly_rent = float(rng.randrange(5000, 9001, 250)) if historic else 0.0
+        rent = monthly_rent or (7500.0 if bedrooms == 3 else 8500.0)
+        # Mitad de los pagos se capturan en meses y mitad en monto
+        if rng.random() < 0.5:
+            paid_months, paid_amount = rng.randrange(0, 25) / 2, 0.0
+        else:
+            paid_months, paid_amount = 0.0, rent * rng.randrange(0, 13)
+        records.append({
+            "tenant_name": f"Inquilino {i}",
+            "unit_code": f"D{100 + i % 16}-{i // 16}",
+            "start_month": rng.randint(1, 12),
+            "start_year": rng.choice((2021, 2022, 2023)) if historic else rng.choice((2024, 2025)),
+            "bedrooms": bedrooms,
+            "monthly_rent": monthly_rent,
+            "paid_months": paid_months,
+            "paid_amount": paid_amount,
+        })
+    return records
+
+
+def with_dict(cls: type) -> type:
+    """Crea una subclase sin __slots__ (con __dict__) para comparar."""
+    return type(f"{cls.__name__}ConDict", (cls,), {})
+
+
+def contract_builder(version: str, module: ModuleType, slotted: bool = True) -> Callable[[Dict], object]:
+    """
+    Regresa una función que crea el contrato de un registro en la versión
+    indicada, con la misma regla estándar/histórico que usa cada programa.
+
+    Args:
+        version (str): Clave de VERSIONS
+        module (ModuleType): Módulo de la versión
+        slotted (bool): False para usar subclases con __dict__
+
+    Returns:
+        Callable[[Dict], object]: Fábrica de contratos
+    """
+    standard = module.StandardContract
+    historic = module.HistoricContract
+    if not slotted:
+        standard, historic = with_dict(standard), with_dict(historic)
+
+    def build(record: Dict) -> object:
+        args = (record["tenant_name"], record["unit_code"],
+                record["start_month"], record["start_year"])
+        if not 2024 <= record["start_year"] <= 2025:
+            return historic(*args, record["monthly_rent"])
+        if version == "V1":
+            rent = 7500.0 if record["bedrooms"] == 3 else 8500.0
+            return standard(*args, rent, record["bedrooms"])
+        return standard(*args, record["bedrooms"])
+
+    return build
+
+
+# =========================
+# Mediciones
+# =========================
+
+def best_time(function: Callable[[], object], repeat: int) -> float:
+    """
+    Ejecuta una función varias veces y regresa el mejor tiempo.
+
+    Args:
+        function (Callable[[], object]): Función a medir
+        repeat (int): Repeticiones
+
+    Returns:
+        float: Segundos de la corrida más rápida
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure_footprint(build: Callable[[Dict], object], records: List[Dict]) -> float:
+    """
+    Mide la memoria promedio por contrato (incluye sus cadenas).
+
+    Args:
+        build (Callable[[Dict], object]): Fábrica de contratos
+        records (List[Dict]): Registros a convertir
+
+    Returns:
+        float: Bytes por contrato
+    """
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    contracts = [build(record) for record in records]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    # Se descuenta la lista que contiene los contratos
+    allocated -= sys.getsizeof(contracts)
+    return allocated / len(contracts)
+
+
+def benchmark_version(version: str, records: List[Dict], repeat: int) -> Dict[str, float]:
+    """
+    Mide las operaciones del motor de contratos de una versión.
+
+    Args:
+        version (str): Clave de VERSIONS
+        records (List[Dict]): Portafolio sintético
+        repeat (int): Repeticiones por medición (se toma la mejor)
+
+    Returns:
+        Dict[str, float]: Segundos por operación y bytes por contrato
+    """
+    module = load_version(version)
+    build = contract_builder(version, module)
+    payments = [(record["paid_months"], record["paid_amount"]) for record in records]
+    results: Dict[str, float] = {}
+
+    results["construccion_s"] = best_time(lambda: [build(record) for record in records], repeat)
+    contracts = [build(record) for record in records]
+
+    if version == "V2":
+        def set_all_payments():
+            for contract, (months, amount) in zip(contracts, payments):
+                contract.set_payments(months, amount)
+
+        results["set_payments_s"] = best_time(set_all_payments, repeat)
+        results["infer_s"] = best_time(
+            lambda: [contract.infer_months_or_amount() for contract in contracts], repeat)
+        results["balance_s"] = best_time(
+            lambda: [contract.balance(CURRENT_MONTH) for contract in contracts], repeat)
+
+        manager = module.BuildingManager(2025, CURRENT_MONTH)
+        results["add_contract_s"] = best_time(
+            lambda: [manager.add_contract(contract) for contract in contracts], 1)
+
+        def full_statistics():
+            manager.invalidate_cache()
+            return manager.calculate_statistics()
+
+        results["total_edificio_s"] = best_time(manager.calculate_building_total, repeat)
+        results["estadisticas_s"] = best_time(manager.calculate_statistics, repeat)
+        results["estadisticas_recalculo_s"] = best_time(full_statistics, repeat)
+    else:
+        pairs = list(zip(contracts, payments))
+
+        def infer_all():
+            return [contract.infer_months_or_amount(months, amount)
+                    for contract, (months, amount) in pairs]
+
+        inferred = infer_all()
+        if version == "V1":
+            def balance_all():
+                return [contract.balance(CURRENT_MONTH, months, amount)
+                        for contract, (months, amount) in zip(contracts, inferred)]
+        else:
+            def balance_all():
+                return [contract.balance(CURRENT_MONTH, amount)
+                        for contract, (_, amount) in zip(contracts, inferred)]
+
+        def building_close():
+            # Mismo trabajo que el ciclo de captura: inferir, balancear y sumar
+            total = 0.0
+            with_debt = 0
+            for contract, (months, amount) in pairs:
+                months, amount = contract.infer_months_or_amount(months, amount)
+                if version == "V1":
+                    _, debt, _ = contract.balance(CURRENT_MONTH, months, amount)
+                else:
+                    _, debt, _ = contract.balance(CURRENT_MONTH, amount)
+                total += amount
+                with_debt += debt > 0
+            return total, with_debt
+
+        results["infer_s"] = best_time(infer_all, repeat)
+        results["balance_s"] = best_time(balance_all, repeat)
+        results["estadisticas_recalculo_s"] = best_time(building_close, repeat)
+
+    results["bytes_por_contrato_slots"] = measure_footprint(build, records)
+    results["bytes_por_contrato_dict"] = measure_footprint(
+        contract_builder(version, module, slotted=False), records)
+    return results
+
+
+def run_suite(count: int, historic_ratio: float, seed: int, repeat: int) -> Dict:
+    """
+    Ejecuta los benchmarks de las tres versiones.
+
+    Args:
+        count (int): Contratos del portafolio sintético
+        historic_ratio (float): Fracción de contratos históricos
+        seed (int): Semilla del generador
+        repeat (int): Repeticiones por medición
+
+    Returns:
+        Dict: Parámetros, entorno y resultados por versión
+    """
+    records = generate_records(count, historic_ratio, seed)
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "parametros": {
+            "contratos": count,
+            "historicos": historic_ratio,
+            "semilla": seed,
+            "repeticiones": repeat,
+            "mes_actual": CURRENT_MONTH,
+        },
+        "versiones": {version: benchmark_version(version, records, repeat)
+                      for version in VERSIONS},
+    }
+
+
+# =========================
+# Reporte
+# =========================
+
+def print_results(results: Dict, baseline: Optional[Dict] = None):
+    """
+    Muestra los resultados; si hay una corrida base, agrega la razón
+    actual/base de cada medición (> 1 = más lento o más memoria).
+
+    Args:
+        results (Dict): Resultados de run_suite
+        baseline (Optional[Dict]): Resultados de una corrida anterior
+    """
+    count = results["parametros"]["contratos"]
+    print(f"Benchmark del motor de contratos ({count:,} contratos, "
+          f"{results['parametros']['historicos']:.0%} históricos)")
+
+    for version, metrics in results["versiones"].items():
+        base = (baseline or {}).get("versiones", {}).get(version, {})
+        print(f"\n{version}")
+        for name, value in metrics.items():
+            if name.endswith("_s"):
+                line = f"  {name:<28}{value * 1000:>10.3f} ms{count / value if value else 0:>18,.0f} contratos/s"
+            else:
+                line = f"  {name:<28}{value:>10.0f} B "
+            if name in base and base[name]:
+                line += f"   x{value / base[name]:.2f}"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks del motor de contratos")
+    parser.add_argument("--contratos", type=int, default=100_000,
+                        help="Tamaño del portafolio sintético (default: 100000)")
+    parser.add_argument("--historicos", type=float, default=0.3,
+                        help="Fracción de contratos históricos, 0..1 (default: 0.3)")
+    parser.add_argument("--semilla", type=int, default=2025,
+                        help="Semilla del generador (default: 2025)")
+    parser.add_argument("--repeticiones", type=int, default=3,
+                        help="Repeticiones por medición; se toma la mejor (default: 3)")
+    parser.add_argument("--salida", help="Archivo JSON donde guardar los resultados")
+    parser.add_argument("--comparar", help="Archivo JSON de una corrida anterior")
+    args = parser.parse_args()
+
+    if not 0 <= args.historicos <= 1:
+        raise SystemExit("Error: --historicos debe estar entre 0 y 1.")
+
+    results = run_suite(args.contratos, args.historicos, args.semilla, args.repeticiones)
+
+    baseline = None
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+    print_results(results, baseline)
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2, ensure_ascii=False)
+        print(f"\nResultados guardados en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+"""
+Paquete de apoyo del proyecto final (V2).
+
+El punto de entrada sigue siendo Avance_Proyecto Final_V2.py; aquí están el
+modelo de contratos y la infraestructura que usa:
+
+- modelo: montos, programa de rentas, contratos y lectura de archivos.
+- persistencia: repositorio SQLite, snapshot binario y padrones.
+- servicio: servicio de pagos asyncio.
+- perfil: perfilador opcional (--perfil).
+"""
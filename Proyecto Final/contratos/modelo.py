@@ -0,0 +1,754 @@
+"""
+Modelo de contratos de renta
+============================
+
+Montos en centavos, programa de rentas, contratos (estándar e históricos)
+con su libro de pagos, y lectura de contratos desde archivos CSV o JSONL.
+"""
+
+import bisect
+import csv
+import json
+import math
+from abc import ABC, abstractmethod
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+
+def to_cents(amount: float) -> int:
+    """
+    Convierte un monto en pesos a centavos enteros (redondeado al centavo).
+    Los cálculos de dinero se hacen en centavos para que las sumas sean exactas.
+    Un monto infinito o NaN lanza ValueError.
+    """
+    if not math.isfinite(amount):
+        raise ValueError(f"El monto debe ser un número finito: {amount}")
+    return int(round(amount * 100))
+
+
+def from_cents(cents: int) -> float:
+    """
+    Convierte centavos enteros a pesos.
+    """
+    return cents / 100
+
+
+class PaymentEntry(NamedTuple):
+    """
+    Movimiento del libro de pagos de un contrato (solo se agregan, nunca se
+    modifican). Los montos y meses son incrementos sobre el total anterior.
+    """
+    date: str
+    amount_cents: int
+    months: float
+    
+    @property
+    def amount(self) -> float:
+        """Monto del movimiento en pesos."""
+        return from_cents(self.amount_cents)
+
+
+@lru_cache(maxsize=1)
+def iso_date(day: date) -> str:
+    """
+    Convierte una fecha a texto ISO. Los movimientos del mismo día
+    comparten la misma cadena en lugar de crear una por movimiento.
+    """
+    return day.isoformat()
+
+
+def month_index(year: int, month: int) -> int:
+    """
+    Convierte (año, mes) en un número de mes absoluto para comparar y
+    restar fechas.
+    """
+    return year * 12 + month - 1
+
+
+class RentSchedule:
+    """
+    Programa de rentas de un contrato a lo largo de varios años.
+    
+    Guarda los periodos de renta (desde qué mes aplica cada renta) y una
+    tabla de sumas acumuladas de lo adeudado al inicio de cada periodo, de
+    modo que lo adeudado a cualquier (año, mes) se obtiene con una búsqueda
+    binaria, sin recorrer los meses. Las rentas y sumas se guardan en centavos.
+    """
+    
+    __slots__ = ("_starts", "_rates", "_cumulative")
+    
+    def __init__(self, start_year: int, start_month: int, monthly_rent: float):
+        """
+        Inicializa el programa con la renta de inicio del contrato.
+        
+        Args:
+            start_year (int): Año de inicio del contrato
+            start_month (int): Mes de inicio del contrato (1-12)
+            monthly_rent (float): Renta mensual inicial
+        """
+        self._starts = [month_index(start_year, start_month)]
+        self._rates = [to_cents(monthly_rent)]
+        # Adeudo acumulado (centavos) antes del inicio de cada periodo
+        self._cumulative = [0]
+    
+    def add_rate(self, year: int, month: int, monthly_rent: float):
+        """
+        Registra un cambio de renta (ej. renovación) a partir de un mes.
+        Los cambios deben agregarse en orden cronológico.
+        
+        Args:
+            year (int): Año desde el que aplica la nueva renta
+            month (int): Mes desde el que aplica la nueva renta (1-12)
+            monthly_rent (float): Nueva renta mensual
+        """
+        start = month_index(year, month)
+        if start <= self._starts[-1]:
+            raise ValueError("Los cambios de renta deben registrarse en orden cronológico")
+        if monthly_rent < 0:
+            raise ValueError("La renta no puede ser negativa")
+        self._cumulative.append(self._cumulative[-1]
+                                + (start - self._starts[-1]) * self._rates[-1])
+        self._starts.append(start)
+        self._rates.append(to_cents(monthly_rent))
+    
+    def periods(self) -> List[Tuple[int, int, float]]:
+        """
+        Obtiene los periodos de renta.
+        
+        Returns:
+            List[Tuple[int, int, float]]: (año, mes, renta) de cada periodo
+        """
+        return [(start // 12, start % 12 + 1, from_cents(rate))
+                for start, rate in zip(self._starts, self._rates)]
+    
+    def rate_at(self, year: int, month: int) -> float:
+        """
+        Obtiene la renta vigente en un mes (0 antes del inicio del contrato).
+        
+        Args:
+            year (int): Año
+            month (int): Mes (1-12)
+            
+        Returns:
+            float: Renta mensual vigente
+        """
+        position = bisect.bisect_right(self._starts, month_index(year, month)) - 1
+        return from_cents(self._rates[position]) if position >= 0 else 0.0
+    
+    def cumulative_due_cents(self, year: int, month: int) -> int:
+        """
+        Calcula lo adeudado desde el inicio del contrato hasta el mes
+        indicado (incluyente), sin considerar pagos.
+        
+        Args:
+            year (int): Año
+            month (int): Mes (1-12)
+            
+        Returns:
+            int: Renta acumulada a esa fecha, en centavos
+        """
+        target = month_index(year, month)
+        position = bisect.bisect_right(self._starts, target) - 1
+        if position < 0:
+            return 0
+        return (self._cumulative[position]
+                + (target - self._starts[position] + 1) * self._rates[position])
+    
+    def cumulative_due(self, year: int, month: int) -> float:
+        """
+        Igual que cumulative_due_cents, en pesos.
+        """
+        return from_cents(self.cumulative_due_cents(year, month))
+    
+    def due_in_year_cents(self, year: int, month: int) -> int:
+        """
+        Calcula lo adeudado en el año indicado, de enero (o del inicio del
+        contrato) hasta el mes indicado.
+        
+        Args:
+            year (int): Año
+            month (int): Mes (1-12)
+            
+        Returns:
+            int: Renta acumulada en el año a esa fecha, en centavos
+        """
+        return self.cumulative_due_cents(year, month) - self.cumulative_due_cents(year - 1, 12)
+    
+    def due_in_year(self, year: int, month: int) -> float:
+        """
+        Igual que due_in_year_cents, en pesos.
+        """
+        return from_cents(self.due_in_year_cents(year, month))
+    
+    def billed_rate_cents(self, year: int, month: int) -> int:
+        """
+        Obtiene la renta que se cobra en un mes con la regla de corte del
+        programa: antes del inicio del contrato aplica la renta inicial.
+        
+        Args:
+            year (int): Año
+            month (int): Mes (1-12)
+            
+        Returns:
+            int: Renta mensual cobrada, en centavos
+        """
+        position = bisect.bisect_right(self._starts, month_index(year, month)) - 1
+        return self._rates[max(position, 0)]
+    
+    def billed_in_year_cents(self, year: int, month: int) -> int:
+        """
+        Calcula lo que se cobra de enero al mes indicado con la regla de
+        corte del programa (un mes de renta por cada mes transcurrido, sin
+        importar el inicio del contrato); los cambios de renta solo cambian
+        la renta de cada mes.
+        
+        Args:
+            year (int): Año
+            month (int): Mes (1-12)
+            
+        Returns:
+            int: Renta cobrada en el año a esa fecha, en centavos
+        """
+        before_start = min(max(self._starts[0] - month_index(year, 1), 0), month)
+        return before_start * self._rates[0] + self.due_in_year_cents(year, month)
+
+
+class BaseContract(ABC):
+    """
+    Clase base abstracta que define los atributos y métodos comunes
+    para todos los tipos de contratos de renta.
+    
+    Usa __slots__ para no reservar un __dict__ por contrato, lo que reduce
+    la memoria al manejar portafolios grandes.
+    """
+    
+    __slots__ = ("tenant_name", "unit_code", "start_month", "start_year",
+                 "_rent_cents", "_paid_months", "_paid_cents", "_ledger",
+                 "_listener", "schedule")
+    
+    def __init__(self, tenant_name: str, unit_code: str, start_month: int, 
+                 start_year: int, monthly_rent: float):
+        """
+        Inicializa un contrato base.
+        
+        Args:
+            tenant_name (str): Nombre del inquilino
+            unit_code (str): Código del departamento (ej. D101, D202)
+            start_month (int): Mes de inicio del contrato (1-12)
+            start_year (int): Año de inicio del contrato
+            monthly_rent (float): Renta mensual
+        """
+        self.tenant_name = tenant_name
+        self.unit_code = unit_code
+        self.start_month = start_month
+        self.start_year = start_year
+        self.monthly_rent = monthly_rent
+        # Totales acumulados del libro de pagos (se actualizan en cada movimiento)
+        self._paid_months = 0.0
+        self._paid_cents = 0
+        # Libro de pagos; se crea con el primer movimiento (None = sin movimientos)
+        self._ledger: Optional[List[PaymentEntry]] = None
+        # Función a avisar cuando cambian los pagos (la asigna BuildingManager)
+        self._listener: Optional[Callable[["BaseContract", int], None]] = None
+        # Programa de rentas de varios años (opcional, ver add_rent_change)
+        self.schedule: Optional[RentSchedule] = None
+    
+    @property
+    def monthly_rent(self) -> float:
+        """Renta mensual en pesos (se guarda en centavos)."""
+        return from_cents(self._rent_cents)
+    
+    @monthly_rent.setter
+    def monthly_rent(self, monthly_rent: float):
+        self._rent_cents = to_cents(monthly_rent)
+    
+    @property
+    def rent_cents(self) -> int:
+        """Renta mensual en centavos."""
+        return self._rent_cents
+    
+    @property
+    def paid_cents(self) -> int:
+        """Monto pagado en el año actual, en centavos."""
+        return self._paid_cents
+    
+    def _record(self, paid_months: float, paid_cents: int, entry_date: Optional[str]):
+        """
+        Agrega al libro el movimiento que lleva los totales a los valores
+        indicados. Al crear el libro, los totales cargados con
+        restore_payments quedan como movimiento de apertura (sin fecha).
+        
+        Args:
+            paid_months (float): Nuevo total de meses pagados
+            paid_cents (int): Nuevo total de monto pagado, en centavos
+            entry_date (Optional[str]): Fecha ISO del movimiento (hoy si es None)
+        """
+        if self._ledger is None:
+            self._ledger = []
+            if self._paid_cents or self._paid_months:
+                self._ledger.append(PaymentEntry("", self._paid_cents, self._paid_months))
+        self._ledger.append(PaymentEntry(entry_date or iso_date(date.today()),
+                                         paid_cents - self._paid_cents,
+                                         paid_months - self._paid_months))
+        self._apply(paid_months, paid_cents)
+    
+    def _apply(self, paid_months: float, paid_cents: int):
+        """
+        Actualiza los totales y avisa al listener.
+        """
+        previous_cents = self._paid_cents
+        self._paid_months = paid_months
+        self._paid_cents = paid_cents
+        if self._listener is not None:
+            self._listener(self, previous_cents)
+    
+    def set_payments(self, paid_months: float = 0.0, paid_amount: float = 0.0,
+                     entry_date: Optional[str] = None):
+        """
+        Establece los pagos realizados en el año actual.
+        
+        El ajuste respecto a los totales anteriores queda registrado en el
+        libro de pagos, por lo que el historial no se pierde.
+        
+        Args:
+            paid_months (float): Meses pagados
+            paid_amount (float): Monto pagado
+            entry_date (Optional[str]): Fecha ISO del registro (hoy si es None)
+        """
+        paid_months, paid_cents = self._infer(paid_months, to_cents(paid_amount))
+        self._record(paid_months, paid_cents, entry_date)
+    
+    def restore_payments(self, paid_months: float = 0.0, paid_amount: float = 0.0):
+        """
+        Establece los pagos de un contrato cargado (archivo, base de datos o
+        snapshot) sin escribir en el libro de pagos, para no reservar un
+        libro por contrato en cargas masivas.
+        
+        Args:
+            paid_months (float): Meses pagados
+            paid_amount (float): Monto pagado
+        """
+        self._apply(*self._infer(paid_months, to_cents(paid_amount)))
+    
+    def post_payment(self, amount: float, entry_date: Optional[str] = None):
+        """
+        Registra un pago en el libro y actualiza los totales en O(1).
+        
+        Args:
+            amount (float): Monto pagado
+            entry_date (Optional[str]): Fecha ISO del pago (hoy si es None)
+        """
+        cents = to_cents(amount)
+        months = cents / self._rent_cents if self._rent_cents > 0 else 0.0
+        self._record(self._paid_months + months, self._paid_cents + cents, entry_date)
+    
+    def payment_history(self) -> List[PaymentEntry]:
+        """
+        Obtiene una copia de los movimientos del libro de pagos.
+        
+        Returns:
+            List[PaymentEntry]: Movimientos en el orden en que se registraron
+        """
+        return list(self._ledger or ())
+    
+    def replay_payments(self, until: Optional[str] = None) -> Tuple[float, float]:
+        """
+        Recalcula los totales a partir del libro de pagos.
+        
+        Si el contrato no tiene movimientos (solo pagos cargados con
+        restore_payments), regresa los totales actuales.
+        
+        Args:
+            until (Optional[str]): Fecha ISO límite (incluyente); None = todo
+            
+        Returns:
+            Tuple[float, float]: (meses_pagados, monto_pagado) a esa fecha
+        """
+        if self._ledger is None:
+            return self.get_payment_info()
+        paid_months = 0.0
+        paid_cents = 0
+        for entry in self._ledger:
+            if until is None or entry.date <= until:
+                paid_months += entry.months
+                paid_cents += entry.amount_cents
+        return paid_months, from_cents(paid_cents)
+    
+    def _infer(self, paid_months: float, paid_cents: int) -> Tuple[float, int]:
+        """
+        Aplica la regla de inferencia a un par (meses, centavos).
+        """
+        if paid_months == 0 and self._rent_cents > 0:
+            paid_months = paid_cents / self._rent_cents
+        
+        if paid_cents == 0:
+            paid_cents = round(paid_months * self._rent_cents)
+        
+        return paid_months, paid_cents
+    
+    def infer_months_or_amount(self) -> Tuple[float, float]:
+        """
+        Infiere los meses pagados o el monto pagado basándose en el otro valor.
+        Si meses_pagados = 0, infiere por monto.
+        Si monto = 0, infiere por meses.
+        
+        Los pagos ya se infieren al registrarse, así que normalmente los
+        totales no cambian.
+        
+        Returns:
+            Tuple[float, float]: (meses_pagados, monto_pagado)
+        """
+        self._paid_months, self._paid_cents = self._infer(self._paid_months,
+                                                          self._paid_cents)
+        return self._paid_months, from_cents(self._paid_cents)
+    
+    def add_rent_change(self, year: int, month: int, monthly_rent: float):
+        """
+        Registra un cambio de renta a partir de un mes (ej. renovación). El
+        primer cambio crea el programa de rentas del contrato.
+        
+        Si el contrato ya está en un BuildingManager, se debe llamar a su
+        invalidate_cache() para recalcular las estadísticas.
+        
+        Args:
+            year (int): Año desde el que aplica la nueva renta
+            month (int): Mes desde el que aplica la nueva renta (1-12)
+            monthly_rent (float): Nueva renta mensual
+        """
+        if self.schedule is None:
+            self.schedule = RentSchedule(self.start_year, self.start_month,
+                                         self.monthly_rent)
+        self.schedule.add_rate(year, month, monthly_rent)
+    
+    def add_rent_changes(self, rent_changes: str):
+        """
+        Registra cambios de renta escritos como en los archivos de contratos
+        ("AAAA-MM:renta" separados por ";").
+        
+        Args:
+            rent_changes (str): Cambios de renta ("" = ninguno)
+        """
+        for change in rent_changes.split(";"):
+            if change.strip():
+                period, monthly_rent = change.split(":")
+                year, month = period.split("-")
+                self.add_rent_change(int(year), int(month), float(monthly_rent))
+    
+    def rent_changes(self) -> str:
+        """
+        Obtiene los cambios de renta del programa en el formato que lee
+        add_rent_changes.
+        
+        Returns:
+            str: Cambios de renta ("" si el contrato no tiene programa)
+        """
+        if self.schedule is None:
+            return ""
+        return ";".join(f"{year:04d}-{month:02d}:{monthly_rent:.2f}"
+                        for year, month, monthly_rent in self.schedule.periods()[1:])
+    
+    def expected_due_cents(self, current_month: int, current_year: Optional[int] = None) -> int:
+        """
+        Calcula el adeudo esperado hasta el mes actual, en centavos.
+        
+        Se cobra un mes de renta por cada mes transcurrido desde enero,
+        empiece cuando empiece el contrato. Si el contrato tiene programa de
+        rentas y se indica el año, cada mes se cobra con la renta vigente en
+        ese mes (ver RentSchedule.billed_in_year_cents).
+        
+        Args:
+            current_month (int): Mes actual (1-12)
+            current_year (Optional[int]): Año actual
+            
+        Returns:
+            int: Centavos que debería haber pagado hasta la fecha
+        """
+        if self.schedule is None or current_year is None:
+            return current_month * self._rent_cents
+        return self.schedule.billed_in_year_cents(current_year, current_month)
+    
+    def expected_due(self, current_month: int, current_year: Optional[int] = None) -> float:
+        """
+        Calcula el adeudo esperado hasta el mes actual.
+        
+        Args:
+            current_month (int): Mes actual (1-12)
+            current_year (Optional[int]): Año actual (para el programa de rentas)
+            
+        Returns:
+            float: Monto que debería haber pagado hasta la fecha
+        """
+        return from_cents(self.expected_due_cents(current_month, current_year))
+    
+    def rent_cents_at(self, current_month: int, current_year: Optional[int] = None) -> int:
+        """
+        Obtiene la renta mensual que se cobra en el mes indicado, en centavos.
+        
+        Args:
+            current_month (int): Mes actual (1-12)
+            current_year (Optional[int]): Año actual (para el programa de rentas)
+            
+        Returns:
+            int: Renta vigente; la renta fija si no hay programa o año
+        """
+        if self.schedule is None or current_year is None:
+            return self._rent_cents
+        return self.schedule.billed_rate_cents(current_year, current_month)
+    
+    def rent_at(self, current_month: int, current_year: Optional[int] = None) -> float:
+        """
+        Igual que rent_cents_at, en pesos.
+        """
+        return from_cents(self.rent_cents_at(current_month, current_year))
+    
+    def balance_cents(self, current_month: int, current_year: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Calcula el balance del contrato en centavos (cálculo exacto).
+        
+        Args:
+            current_month (int): Mes actual
+            current_year (Optional[int]): Año actual (para el programa de rentas)
+            
+        Returns:
+            Tuple[int, int]: (adeudo, saldo_a_favor) en centavos
+        """
+        # Los totales del libro ya están inferidos: solo se leen
+        difference = self._paid_cents - self.expected_due_cents(current_month, current_year)
+        
+        if difference < 0:
+            return -difference, 0  # Tiene adeudo
+        else:
+            return 0, difference   # Tiene saldo a favor
+    
+    def balance(self, current_month: int, current_year: Optional[int] = None) -> Tuple[float, float]:
+        """
+        Calcula el balance del contrato (adeudo o saldo a favor).
+        
+        Args:
+            current_month (int): Mes actual
+            current_year (Optional[int]): Año actual (para el programa de rentas)
+            
+        Returns:
+            Tuple[float, float]: (adeudo, saldo_a_favor)
+        """
+        adeudo, saldo_favor = self.balance_cents(current_month, current_year)
+        return from_cents(adeudo), from_cents(saldo_favor)
+    
+    def get_payment_info(self) -> Tuple[float, float]:
+        """
+        Obtiene la información de pagos actuales.
+        
+        Returns:
+            Tuple[float, float]: (meses_pagados, monto_pagado)
+        """
+        return self._paid_months, from_cents(self._paid_cents)
+    
+    @abstractmethod
+    def get_contract_type(self) -> str:
+        """
+        Método abstracto que debe ser implementado por las clases hijas
+        para identificar el tipo de contrato.
+        """
+        pass
+
+
+class StandardContract(BaseContract):
+    """
+    Contrato estándar para periodos 2024-2025.
+    La renta mensual se fija automáticamente según el número de recámaras.
+    """
+    
+    __slots__ = ("bedrooms",)
+    
+    def __init__(self, tenant_name: str, unit_code: str, start_month: int, 
+                 start_year: int, bedrooms: int):
+        """
+        Inicializa un contrato estándar.
+        
+        Args:
+            tenant_name (str): Nombre del inquilino
+            unit_code (str): Código del departamento
+            start_month (int): Mes de inicio del contrato
+            start_year (int): Año de inicio del contrato
+            bedrooms (int): Número de recámaras (3 o 4)
+        """
+        # Establecer renta según número de recámaras
+        if bedrooms == 3:
+            monthly_rent = 7500.0
+        elif bedrooms == 4:
+            monthly_rent = 8500.0
+        else:
+            raise ValueError("Los departamentos solo pueden ser de 3 o 4 recámaras")
+        
+        super().__init__(tenant_name, unit_code, start_month, start_year, monthly_rent)
+        self.bedrooms = bedrooms
+    
+    def get_contract_type(self) -> str:
+        """
+        Retorna el tipo de contrato.
+        
+        Returns:
+            str: Tipo de contrato
+        """
+        return f"Estándar 2024-2025 ({self.bedrooms} recámaras)"
+
+
+class HistoricContract(BaseContract):
+    """
+    Contrato histórico (anterior a 2024 o posterior a 2025).
+    La renta mensual es ingresada manualmente por el usuario.
+    """
+    
+    __slots__ = ()
+    
+    def __init__(self, tenant_name: str, unit_code: str, start_month: int, 
+                 start_year: int, monthly_rent: float):
+        """
+        Inicializa un contrato histórico.
+        
+        Args:
+            tenant_name (str): Nombre del inquilino
+            unit_code (str): Código del departamento
+            start_month (int): Mes de inicio del contrato
+            start_year (int): Año de inicio del contrato
+            monthly_rent (float): Renta mensual del contrato original
+        """
+        super().__init__(tenant_name, unit_code, start_month, start_year, monthly_rent)
+    
+    def get_contract_type(self) -> str:
+        """
+        Retorna el tipo de contrato.
+        
+        Returns:
+            str: Tipo de contrato
+        """
+        return f"Histórico ({self.start_year})"
+
+
+def validate_month(month: int) -> bool:
+    """
+    Valida que el mes esté en el rango correcto.
+    
+    Args:
+        month (int): Mes a validar
+        
+    Returns:
+        bool: True si el mes es válido
+    """
+    return 1 <= month <= 12
+
+
+def build_contract(tenant_name: str, unit_code: str, start_month: int,
+                   start_year: int, bedrooms: int,
+                   monthly_rent: float = 0.0) -> BaseContract:
+    """
+    Crea el contrato que corresponde según el año de inicio.
+    
+    Los contratos 2024-2025 son estándar (renta por recámaras); el resto son
+    históricos y requieren la renta mensual estipulada.
+    
+    Args:
+        tenant_name (str): Nombre del inquilino
+        unit_code (str): Código del departamento
+        start_month (int): Mes de inicio del contrato (1-12)
+        start_year (int): Año de inicio del contrato
+        bedrooms (int): Número de recámaras (3 o 4)
+        monthly_rent (float): Renta mensual (solo contratos históricos)
+        
+    Returns:
+        BaseContract: Contrato creado
+    """
+    if 2024 <= start_year <= 2025:
+        return StandardContract(tenant_name, unit_code, start_month,
+                                start_year, bedrooms)
+    if monthly_rent <= 0:
+        raise ValueError("La renta de un contrato histórico debe ser mayor a 0")
+    return HistoricContract(tenant_name, unit_code, start_month,
+                            start_year, monthly_rent)
+
+
+def contract_from_record(record: Dict[str, str]) -> BaseContract:
+    """
+    Construye un contrato (con sus pagos) a partir de un registro de archivo.
+    
+    Campos esperados: tenant_name, unit_code, start_month, start_year,
+    bedrooms, y opcionalmente monthly_rent, paid_months, paid_amount y
+    rent_changes (cambios de renta "AAAA-MM:renta" separados por ";").
+    
+    Args:
+        record (Dict[str, str]): Registro leído de CSV o JSONL
+        
+    Returns:
+        BaseContract: Contrato con pagos establecidos
+    """
+    tenant_name = str(record["tenant_name"]).strip()
+    unit_code = str(record["unit_code"]).strip()
+    if not tenant_name or not unit_code:
+        raise ValueError("El nombre del inquilino y el departamento son obligatorios")
+    
+    start_month = int(record["start_month"])
+    if not validate_month(start_month):
+        raise ValueError("El mes debe estar entre 1 y 12.")
+    
+    contract = build_contract(
+        tenant_name,
+        unit_code,
+        start_month,
+        int(record["start_year"]),
+        int(record.get("bedrooms") or 0),
+        float(record.get("monthly_rent") or 0.0),
+    )
+    
+    paid_months = float(record.get("paid_months") or 0.0)
+    paid_amount = float(record.get("paid_amount") or 0.0)
+    if not (math.isfinite(paid_months) and math.isfinite(paid_amount)):
+        raise ValueError("Los pagos deben ser números finitos.")
+    if paid_months < 0 or paid_amount < 0:
+        raise ValueError("Los pagos no pueden ser negativos.")
+    contract.add_rent_changes(str(record.get("rent_changes") or ""))
+    
+    # Establecer pagos (restore_payments calcula el dato faltante)
+    contract.restore_payments(paid_months, paid_amount)
+    return contract
+
+
+def iter_contract_records(path: str) -> Iterator[Dict[str, str]]:
+    """
+    Lee de forma perezosa los registros de un archivo CSV o JSONL.
+    
+    El formato se decide por la extensión (.jsonl/.json = JSON por línea,
+    cualquier otra = CSV con encabezados).
+    
+    Args:
+        path (str): Ruta del archivo
+        
+    Yields:
+        Dict[str, str]: Un registro por contrato
+    """
+    suffix = Path(path).suffix.lower()
+    with open(path, newline="", encoding="utf-8-sig") as handle:
+        if suffix in (".jsonl", ".json"):
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(handle)
+
+
+def iter_contracts(path: str) -> Iterator[BaseContract]:
+    """
+    Construye de forma perezosa los contratos de un archivo CSV o JSONL.
+    
+    Args:
+        path (str): Ruta del archivo
+        
+    Yields:
+        BaseContract: Contratos con sus pagos establecidos
+    """
+    for line_number, record in enumerate(iter_contract_records(path), start=1):
+        try:
+            yield contract_from_record(record)
+        except (KeyError, TypeError, ValueError, OverflowError) as error:
+            raise ValueError(f"Registro {line_number} inválido en {path}: {error}") from error
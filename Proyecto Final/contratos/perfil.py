@@ -0,0 +1,185 @@
+"""
+Perfilador del motor de contratos
+=================================
+
+Mide llamadas y tiempos de funciones seleccionadas reemplazándolas mientras
+está activo; el reporte se guarda en JSON o en formato pstats.
+"""
+
+import json
+import marshal
+import time
+from functools import wraps
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+
+class Profiler:
+    """
+    Instrumentación opcional de las funciones más usadas del motor.
+    
+    Mientras está desactivado no se toca ningún método, así que no cuesta
+    nada. enable() reemplaza cada función indicada por una versión que
+    mide llamadas, tiempo acumulado, tiempo propio (sin contar otras
+    funciones medidas) y un histograma de duraciones en potencias de 2 de
+    nanosegundos; disable() restaura las originales.
+    
+    El reporte se exporta en JSON o en el formato de cProfile, que se puede
+    abrir con pstats (python -m pstats perfil.prof).
+    
+    Nota: solo mide el proceso actual; en el cierre del portafolio con
+    varios procesos se mide la parte que corre en el proceso principal.
+    """
+    
+    def __init__(self, targets: Iterable[Tuple[Any, str]]):
+        """
+        Prepara el perfilador (desactivado).
+        
+        Args:
+            targets (Iterable[Tuple[Any, str]]): Funciones a medir como
+                (clase o módulo, nombre); las de un módulo deben reemplazarse
+                en el módulo desde donde se llaman
+        """
+        self.targets = tuple(targets)
+        self._originals: Dict[Tuple[Any, str], Callable] = {}
+        # etiqueta -> [llamadas, ns acumulados, ns propios, histograma, llamadores, código]
+        self._stats: Dict[str, List[Any]] = {}
+        # Llamadas en curso: [etiqueta, ns de funciones medidas llamadas dentro]
+        self._stack: List[List[Any]] = []
+    
+    @property
+    def enabled(self) -> bool:
+        return bool(self._originals)
+    
+    def enable(self) -> "Profiler":
+        """
+        Reemplaza las funciones indicadas por sus versiones medidas.
+        
+        Returns:
+            Profiler: El mismo perfilador
+        """
+        if self.enabled:
+            return self
+        for owner, name in self.targets:
+            function = getattr(owner, name)
+            label = name if isinstance(owner, ModuleType) else f"{owner.__name__}.{name}"
+            self._originals[(owner, name)] = function
+            setattr(owner, name, self._wrap(label, function))
+        return self
+    
+    def disable(self):
+        """
+        Restaura las funciones originales (el reporte se conserva).
+        """
+        for (owner, name), function in self._originals.items():
+            setattr(owner, name, function)
+        self._originals.clear()
+    
+    def __enter__(self) -> "Profiler":
+        return self.enable()
+    
+    def __exit__(self, *exc_info):
+        self.disable()
+    
+    def _wrap(self, label: str, function: Callable) -> Callable:
+        """
+        Construye la versión medida de una función.
+        """
+        code = function.__code__
+        record = self._stats.setdefault(
+            label, [0, 0, 0, {}, {}, (code.co_filename, code.co_firstlineno, label)])
+        stack = self._stack
+        clock = time.perf_counter_ns
+        
+        @wraps(function)
+        def measured(*args, **kwargs):
+            frame = [label, 0]
+            stack.append(frame)
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                stack.pop()
+                record[0] += 1
+                record[1] += elapsed
+                record[2] += elapsed - frame[1]
+                bucket = elapsed.bit_length()
+                record[3][bucket] = record[3].get(bucket, 0) + 1
+                if stack:
+                    caller = stack[-1]
+                    caller[1] += elapsed
+                    record[4][caller[0]] = record[4].get(caller[0], 0) + 1
+        
+        return measured
+    
+    def reset(self):
+        """
+        Descarta las mediciones acumuladas.
+        """
+        for record in self._stats.values():
+            record[:5] = [0, 0, 0, {}, {}]
+    
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Obtiene las mediciones por función, de mayor a menor tiempo acumulado.
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: Por etiqueta: llamadas, segundos
+            acumulados y propios, promedio en microsegundos, llamadores e
+            histograma como pares [límite superior en ns, llamadas]
+        """
+        report = {}
+        for label, (calls, total, own, histogram, callers, _) in sorted(
+                self._stats.items(), key=lambda item: item[1][1], reverse=True):
+            if not calls:
+                continue
+            report[label] = {
+                "calls": calls,
+                "total_s": total / 1e9,
+                "own_s": own / 1e9,
+                "mean_us": total / calls / 1e3,
+                "callers": dict(callers),
+                "histogram_ns": [[1 << bucket, count]
+                                 for bucket, count in sorted(histogram.items())],
+            }
+        return report
+    
+    def write_json(self, path: str):
+        """
+        Guarda el reporte en JSON.
+        
+        Args:
+            path (str): Ruta del archivo
+        """
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(self.report(), handle, ensure_ascii=False, indent=2)
+    
+    def write_pstats(self, path: str):
+        """
+        Guarda el reporte en el formato de cProfile/pstats.
+        
+        Args:
+            path (str): Ruta del archivo
+        """
+        keys = {label: record[5] for label, record in self._stats.items()}
+        stats = {}
+        for label, (calls, total, own, _, callers, key) in self._stats.items():
+            if calls:
+                stats[key] = (calls, calls, own / 1e9, total / 1e9,
+                              {keys[caller]: count for caller, count in callers.items()})
+        with open(path, "wb") as handle:
+            marshal.dump(stats, handle)
+    
+    def write(self, path: str):
+        """
+        Guarda el reporte en JSON si la ruta termina en .json; si no, en
+        formato pstats.
+        
+        Args:
+            path (str): Ruta del archivo
+        """
+        if path.lower().endswith(".json"):
+            self.write_json(path)
+        else:
+            self.write_pstats(path)
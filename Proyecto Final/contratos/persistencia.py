@@ -0,0 +1,550 @@
+"""
+Persistencia de contratos
+=========================
+
+Repositorio SQLite, snapshot binario abierto con mmap y padrones para la
+carga perezosa de contratos (desde archivo o desde la base de datos).
+"""
+
+import csv
+import json
+import mmap
+import sqlite3
+import struct
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .modelo import BaseContract, build_contract, contract_from_record, from_cents
+
+
+class ContractRepository:
+    """
+    Repositorio persistente de contratos en un archivo SQLite local.
+    
+    Cada fila guarda un contrato con sus pagos de un año (llave: año de
+    pagos y contrato, es decir departamento, inicio e inquilino, para que un
+    cambio de inquilino a mitad de año no sobrescriba el contrato anterior),
+    de modo que al iniciar solo se leen los contratos del año que se va a
+    cerrar. Los montos se guardan en centavos (INTEGER).
+    """
+    
+    # Versión del esquema (PRAGMA user_version); las bases creadas con otra
+    # llave no se pueden abrir
+    SCHEMA_VERSION = 2
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS contracts (
+            unit_code    TEXT    NOT NULL,
+            year         INTEGER NOT NULL,
+            tenant_name  TEXT    NOT NULL,
+            start_month  INTEGER NOT NULL,
+            start_year   INTEGER NOT NULL,
+            bedrooms     INTEGER NOT NULL,
+            monthly_rent_cents INTEGER NOT NULL,
+            paid_months        REAL    NOT NULL,
+            paid_amount_cents  INTEGER NOT NULL,
+            rent_changes TEXT NOT NULL DEFAULT '',
+            PRIMARY KEY (unit_code, year, start_year, start_month, tenant_name)
+        );
+        CREATE INDEX IF NOT EXISTS contracts_by_year_start
+            ON contracts (year, start_year, start_month);
+    """
+    
+    UPSERT = """
+        INSERT INTO contracts (unit_code, year, tenant_name, start_month,
+                               start_year, bedrooms, monthly_rent_cents,
+                               paid_months, paid_amount_cents, rent_changes)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (unit_code, year, start_year, start_month, tenant_name) DO UPDATE SET
+            bedrooms = excluded.bedrooms,
+            monthly_rent_cents = excluded.monthly_rent_cents,
+            paid_months = excluded.paid_months,
+            paid_amount_cents = excluded.paid_amount_cents,
+            rent_changes = excluded.rent_changes
+    """
+    
+    def __init__(self, path: str):
+        """
+        Abre (o crea) la base de datos.
+        
+        Args:
+            path (str): Ruta del archivo SQLite
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        # WAL permite leer mientras se escribe y agiliza las escrituras en lote
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        exists = self.connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'contracts'"
+        ).fetchone()
+        if exists and version != self.SCHEMA_VERSION:
+            self.connection.close()
+            raise ValueError(f"{path} usa otra versión del esquema "
+                             f"({version}, se esperaba {self.SCHEMA_VERSION}); "
+                             "vuelva a generarla desde el archivo de contratos")
+        self.connection.executescript(self.SCHEMA)
+        self.connection.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+    
+    def close(self):
+        """
+        Cierra la conexión con la base de datos.
+        """
+        self.connection.close()
+    
+    def __enter__(self) -> "ContractRepository":
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def upsert_contracts(self, contracts: Iterable[BaseContract], year: int,
+                         batch_size: int = 10000) -> int:
+        """
+        Inserta o actualiza contratos con sus pagos del año, en lotes.
+        
+        Args:
+            contracts (Iterable[BaseContract]): Contratos a guardar
+            year (int): Año al que corresponden los pagos
+            batch_size (int): Filas por executemany
+            
+        Returns:
+            int: Número de filas guardadas (un contrato repetido en la
+                entrada actualiza la misma fila y cuenta una sola vez)
+        """
+        keys = set()
+        batch = []
+        with self.connection:
+            for contract in contracts:
+                paid_months = contract.get_payment_info()[0]
+                keys.add((contract.unit_code, contract.start_year,
+                          contract.start_month, contract.tenant_name))
+                batch.append((contract.unit_code, year, contract.tenant_name,
+                              contract.start_month, contract.start_year,
+                              getattr(contract, "bedrooms", 0),
+                              contract.rent_cents, paid_months, contract.paid_cents,
+                              contract.rent_changes()))
+                if len(batch) >= batch_size:
+                    self.connection.executemany(self.UPSERT, batch)
+                    batch.clear()
+            if batch:
+                self.connection.executemany(self.UPSERT, batch)
+        return len(keys)
+    
+    def iter_contracts(self, year: int) -> Iterator[BaseContract]:
+        """
+        Lee los contratos con pagos del año indicado (consulta por índice),
+        los mismos que se guardaron con upsert_contracts.
+        
+        Args:
+            year (int): Año actual
+            
+        Yields:
+            BaseContract: Contratos con sus pagos establecidos
+        """
+        rows = self.connection.execute(
+            """
+            SELECT tenant_name, unit_code, start_month, start_year, bedrooms,
+                   monthly_rent_cents, paid_months, paid_amount_cents, rent_changes
+            FROM contracts
+            WHERE year = ?
+            ORDER BY start_year, start_month
+            """,
+            (year,),
+        )
+        for row in rows:
+            yield self._contract_from_row(row)
+    
+    @staticmethod
+    def _contract_from_row(row: Tuple) -> BaseContract:
+        """
+        Construye un contrato a partir de una fila de la tabla contracts.
+        """
+        (tenant_name, unit_code, start_month, start_year, bedrooms,
+         rent_cents, paid_months, paid_cents, rent_changes) = row
+        contract = build_contract(tenant_name, unit_code, start_month,
+                                  start_year, bedrooms, from_cents(rent_cents))
+        contract.add_rent_changes(rent_changes)
+        contract.restore_payments(paid_months, from_cents(paid_cents))
+        return contract
+    
+    def iter_row_ids(self, year: int,
+                     unit_code: Optional[str] = None) -> Iterator[Tuple[str, int]]:
+        """
+        Lee solo los identificadores de fila (rowid) de los contratos que
+        iter_contracts regresaría, opcionalmente de un solo departamento.
+        
+        Args:
+            year (int): Año actual
+            unit_code (Optional[str]): Departamento a buscar (None = todos)
+            
+        Yields:
+            Tuple[str, int]: (departamento, rowid)
+        """
+        query = """
+            SELECT unit_code, rowid
+            FROM contracts
+            WHERE year = ?
+        """
+        parameters: Tuple = (year,)
+        if unit_code is not None:
+            query += " AND unit_code = ?"
+            parameters += (unit_code,)
+        yield from self.connection.execute(query + " ORDER BY start_year, start_month",
+                                           parameters)
+    
+    def contract_by_row_id(self, row_id: int) -> BaseContract:
+        """
+        Construye el contrato de una fila.
+        
+        Args:
+            row_id (int): rowid de la fila
+            
+        Returns:
+            BaseContract: Contrato con sus pagos establecidos
+        """
+        row = self.connection.execute(
+            """
+            SELECT tenant_name, unit_code, start_month, start_year, bedrooms,
+                   monthly_rent_cents, paid_months, paid_amount_cents, rent_changes
+            FROM contracts
+            WHERE rowid = ?
+            """,
+            (row_id,),
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"No existe la fila {row_id} en {self.path}")
+        return self._contract_from_row(row)
+
+
+class SnapshotRecord(NamedTuple):
+    """
+    Registro de un contrato leído de un snapshot binario, sin construir el
+    objeto de contrato.
+    """
+    rent_cents: int
+    paid_months: float
+    paid_cents: int
+    tenant_index: int
+    unit_index: int
+    changes_index: int
+    start_year: int
+    start_month: int
+    bedrooms: int
+
+
+class ContractSnapshot:
+    """
+    Snapshot binario de contratos, de ancho fijo y abierto con mmap.
+    
+    Estructura del archivo:
+      - Encabezado: firma, versión, número de contratos y de cadenas.
+      - Registros: un struct de ancho fijo por contrato (ver RECORD).
+      - Tabla de cadenas: desplazamientos (uint64) y texto UTF-8. Los nombres
+        y departamentos (y los cambios de renta, en el formato de
+        add_rent_changes) se guardan una sola vez y los registros los
+        referencian por índice.
+    
+    Abrir un snapshot solo lee el encabezado; cada consulta lee únicamente
+    las páginas de los registros que toca.
+    """
+    
+    MAGIC = b"CTRS"
+    VERSION = 3
+    HEADER = struct.Struct("<4sHxxQQ")
+    # Renta y monto pagado en centavos (int64)
+    RECORD = struct.Struct("<qdqIIIHBB")
+    # Índice de cambios de renta de un contrato sin programa de rentas
+    NO_CHANGES = 0xFFFFFFFF
+    OFFSET = struct.Struct("<Q")
+    
+    def __init__(self, path: str):
+        """
+        Abre un snapshot existente.
+        
+        Args:
+            path (str): Ruta del snapshot
+        """
+        self.path = path
+        with open(path, "rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        magic, version, self._count, self._string_count = self.HEADER.unpack_from(self._map, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            self._map.close()
+            raise ValueError(f"{path} no es un snapshot de contratos válido")
+        
+        self._records_offset = self.HEADER.size
+        self._offsets_offset = self._records_offset + self._count * self.RECORD.size
+        self._strings_offset = self._offsets_offset + (self._string_count + 1) * self.OFFSET.size
+    
+    @classmethod
+    def write(cls, path: str, contracts: Iterable[BaseContract]) -> int:
+        """
+        Escribe un snapshot con los contratos indicados.
+        
+        Args:
+            path (str): Ruta del snapshot
+            contracts (Iterable[BaseContract]): Contratos a guardar
+            
+        Returns:
+            int: Número de contratos escritos
+        """
+        strings: Dict[str, int] = {}
+        records = bytearray()
+        
+        for contract in contracts:
+            paid_months = contract.get_payment_info()[0]
+            tenant_index = strings.setdefault(contract.tenant_name, len(strings))
+            unit_index = strings.setdefault(contract.unit_code, len(strings))
+            rent_changes = contract.rent_changes()
+            changes_index = (strings.setdefault(rent_changes, len(strings))
+                             if rent_changes else cls.NO_CHANGES)
+            records += cls.RECORD.pack(contract.rent_cents, paid_months,
+                                       contract.paid_cents, tenant_index, unit_index,
+                                       changes_index, contract.start_year, contract.start_month,
+                                       getattr(contract, "bedrooms", 0))
+        
+        encoded = [text.encode("utf-8") for text in strings]
+        offsets = bytearray()
+        position = 0
+        for data in encoded:
+            offsets += cls.OFFSET.pack(position)
+            position += len(data)
+        offsets += cls.OFFSET.pack(position)
+        
+        count = len(records) // cls.RECORD.size
+        with open(path, "wb") as handle:
+            handle.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, count, len(encoded)))
+            handle.write(records)
+            handle.write(offsets)
+            handle.write(b"".join(encoded))
+        return count
+    
+    def close(self):
+        """
+        Libera el mapeo del archivo.
+        """
+        self._map.close()
+    
+    def __enter__(self) -> "ContractSnapshot":
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def record(self, index: int) -> SnapshotRecord:
+        """
+        Lee un registro sin construir el contrato.
+        
+        Args:
+            index (int): Posición del contrato (0..len-1)
+            
+        Returns:
+            SnapshotRecord: Datos del contrato
+        """
+        if not 0 <= index < self._count:
+            raise IndexError("Índice de contrato fuera de rango")
+        return SnapshotRecord._make(self.RECORD.unpack_from(
+            self._map, self._records_offset + index * self.RECORD.size))
+    
+    def string(self, index: int) -> str:
+        """
+        Lee una cadena de la tabla de cadenas.
+        
+        Args:
+            index (int): Índice de la cadena
+            
+        Returns:
+            str: Texto de la cadena
+        """
+        start, end = struct.unpack_from("<QQ", self._map,
+                                        self._offsets_offset + index * self.OFFSET.size)
+        return self._map[self._strings_offset + start:self._strings_offset + end].decode("utf-8")
+    
+    def contract(self, index: int) -> BaseContract:
+        """
+        Construye el objeto de contrato de un registro.
+        
+        Args:
+            index (int): Posición del contrato
+            
+        Returns:
+            BaseContract: Contrato con sus pagos establecidos
+        """
+        record = self.record(index)
+        contract = build_contract(self.string(record.tenant_index),
+                                  self.string(record.unit_index),
+                                  record.start_month, record.start_year,
+                                  record.bedrooms, from_cents(record.rent_cents))
+        if record.changes_index != self.NO_CHANGES:
+            contract.add_rent_changes(self.string(record.changes_index))
+        contract.restore_payments(record.paid_months, from_cents(record.paid_cents))
+        return contract
+    
+    def iter_records(self) -> Iterator[SnapshotRecord]:
+        """
+        Recorre todos los registros sin construir contratos.
+        
+        Yields:
+            SnapshotRecord: Datos de cada contrato
+        """
+        end = self._offsets_offset
+        view = memoryview(self._map)[self._records_offset:end]
+        try:
+            for values in self.RECORD.iter_unpack(view):
+                yield SnapshotRecord._make(values)
+        finally:
+            view.release()
+    
+    def balances(self, current_month: int,
+                 current_year: Optional[int] = None) -> Iterator[Tuple[float, float]]:
+        """
+        Calcula (adeudo, saldo_a_favor) de cada registro, con la misma regla
+        que BaseContract.balance. Solo se construyen los contratos con
+        cambios de renta (y solo si se indica el año).
+        
+        Args:
+            current_month (int): Mes actual
+            current_year (Optional[int]): Año actual (para el programa de rentas)
+            
+        Yields:
+            Tuple[float, float]: (adeudo, saldo_a_favor) por contrato
+        """
+        for index, record in enumerate(self.iter_records()):
+            if record.changes_index != self.NO_CHANGES and current_year is not None:
+                yield self.contract(index).balance(current_month, current_year)
+                continue
+            difference = from_cents(record.paid_cents - current_month * record.rent_cents)
+            yield (-difference, 0.0) if difference < 0 else (0.0, difference)
+
+
+class ContractRoster(ABC):
+    """
+    Padrón de contratos sin construir: guarda solo referencias ligeras a
+    cada registro (desplazamiento en el archivo o rowid en la base) para
+    que BuildingManager construya los contratos hasta que se consultan.
+    """
+    
+    @abstractmethod
+    def refs(self) -> Iterable[int]:
+        """
+        Obtiene las referencias de todos los contratos, en el orden de carga.
+        """
+        pass
+    
+    @abstractmethod
+    def refs_for(self, unit_code: str) -> List[int]:
+        """
+        Obtiene las referencias de los contratos de un departamento.
+        """
+        pass
+    
+    @abstractmethod
+    def load(self, ref: int) -> BaseContract:
+        """
+        Construye el contrato de una referencia.
+        """
+        pass
+
+
+class FileRoster(ContractRoster):
+    """
+    Padrón de un archivo CSV o JSONL: al abrirlo se recorre una vez para
+    guardar el desplazamiento (en bytes) de cada registro por departamento,
+    y cada contrato se lee y construye al pedirlo.
+    
+    Los registros CSV deben ocupar una sola línea (sin saltos de línea
+    dentro de campos entre comillas).
+    """
+    
+    def __init__(self, path: str):
+        """
+        Indexa el archivo.
+        
+        Args:
+            path (str): Ruta del archivo CSV o JSONL
+        """
+        self.path = path
+        self._is_json = Path(path).suffix.lower() in (".jsonl", ".json")
+        self._header: List[str] = []
+        self._by_unit: Dict[str, List[int]] = {}
+        self._offsets: List[int] = []
+        
+        with open(path, "rb") as handle:
+            offset = 0
+            if not self._is_json:
+                header = handle.readline()
+                offset = len(header)
+                self._header = next(csv.reader([header.decode("utf-8-sig")]))
+                unit_column = self._header.index("unit_code")
+            for line in handle:
+                if line.strip():
+                    if self._is_json:
+                        unit_code = str(json.loads(line)["unit_code"]).strip()
+                    else:
+                        unit_code = next(csv.reader([line.decode("utf-8")]))[unit_column].strip()
+                    self._by_unit.setdefault(unit_code, []).append(offset)
+                    self._offsets.append(offset)
+                offset += len(line)
+        self._handle = open(path, "rb")
+    
+    def __len__(self) -> int:
+        return len(self._offsets)
+    
+    def close(self):
+        """
+        Cierra el archivo.
+        """
+        self._handle.close()
+    
+    def refs(self) -> Iterable[int]:
+        return self._offsets
+    
+    def refs_for(self, unit_code: str) -> List[int]:
+        return self._by_unit.get(unit_code, [])
+    
+    def load(self, ref: int) -> BaseContract:
+        self._handle.seek(ref)
+        line = self._handle.readline().decode("utf-8")
+        try:
+            if self._is_json:
+                record = json.loads(line)
+            else:
+                record = dict(zip(self._header, next(csv.reader([line]))))
+            return contract_from_record(record)
+        except (KeyError, TypeError, ValueError, OverflowError) as error:
+            raise ValueError(f"Registro en el byte {ref} inválido en {self.path}: {error}") from error
+
+
+class RepositoryRoster(ContractRoster):
+    """
+    Padrón de la base de datos: consulta los rowid con el índice de la
+    tabla y construye cada contrato leyendo solo su fila.
+    """
+    
+    def __init__(self, repository: ContractRepository, year: int):
+        """
+        Args:
+            repository (ContractRepository): Repositorio de contratos
+            year (int): Año actual
+        """
+        self.repository = repository
+        self.year = year
+    
+    def refs(self) -> Iterable[int]:
+        return (row_id for _, row_id in
+                self.repository.iter_row_ids(self.year))
+    
+    def refs_for(self, unit_code: str) -> List[int]:
+        return [row_id for _, row_id in
+                self.repository.iter_row_ids(self.year, unit_code)]
+    
+    def load(self, ref: int) -> BaseContract:
+        return self.repository.contract_by_row_id(ref)
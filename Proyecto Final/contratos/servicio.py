@@ -0,0 +1,232 @@
+"""
+Servicio de pagos
+=================
+
+Servicio local (asyncio, TCP) para registrar pagos y consultar balances de
+un edificio desde varias cajas. Atiende al BuildingManager que recibe (ver
+Avance_Proyecto Final_V2.py); solo usa find_by_unit, contract_summary_row,
+calculate_statistics, contracts y el año y mes actuales.
+"""
+
+import asyncio
+import json
+import math
+import sqlite3
+from typing import Any, Dict, List, Optional
+
+from .modelo import BaseContract
+from .persistencia import ContractRepository
+
+
+class PaymentService:
+    """
+    Servicio local (TCP, un JSON por línea) para registrar pagos y consultar
+    balances desde varias cajas al mismo tiempo.
+    
+    Operaciones (campo "op"):
+      - post_payment: unit_code, amount y opcionalmente date.
+      - set_payments: unit_code, paid_months y paid_amount.
+      - lookup: resumen del contrato de unit_code.
+      - balance: adeudo y saldo a favor de unit_code.
+      - stats: estadísticas del edificio.
+    
+    Las consultas se responden desde el BuildingManager en memoria. Los
+    cambios de un mismo contrato se aplican en orden (un candado por
+    departamento) y, si hay repositorio, se guardan en lotes: cada cambio se
+    confirma al cliente cuando su lote quedó escrito.
+    """
+    
+    MUTATIONS = ("post_payment", "set_payments")
+    
+    def __init__(self, manager: Any,
+                 repository: Optional[ContractRepository] = None,
+                 batch_interval: float = 0.05):
+        """
+        Inicializa el servicio.
+        
+        Args:
+            manager (BuildingManager): Administrador con los contratos
+            repository (Optional[ContractRepository]): Base donde guardar cambios
+            batch_interval (float): Segundos entre escrituras en lote
+        """
+        self.manager = manager
+        self.repository = repository
+        self.batch_interval = batch_interval
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._pending: Dict[int, BaseContract] = {}
+        self._waiters: List[asyncio.Future] = []
+        self._flusher: Optional[asyncio.Task] = None
+    
+    def _find_contract(self, unit_code: str) -> BaseContract:
+        """
+        Obtiene el contrato más reciente de un departamento.
+        """
+        contracts = self.manager.find_by_unit(unit_code)
+        if not contracts:
+            raise ValueError(f"No hay contrato para el departamento {unit_code}")
+        return contracts[-1]
+    
+    async def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Atiende una solicitud y construye su respuesta.
+        
+        Args:
+            request (Dict[str, Any]): Solicitud decodificada
+            
+        Returns:
+            Dict[str, Any]: Respuesta con "ok" y los datos o el error
+        """
+        operation = request.get("op")
+        try:
+            if operation == "stats":
+                response = self.manager.calculate_statistics()._asdict()
+            elif operation in self.MUTATIONS:
+                response = await self._mutate(request)
+            else:
+                contract = self._find_contract(str(request["unit_code"]))
+                if operation == "lookup":
+                    response = self.manager.contract_summary_row(contract)
+                elif operation == "balance":
+                    adeudo, saldo_favor = contract.balance(self.manager.current_month,
+                                                           self.manager.current_year)
+                    response = {"unit_code": contract.unit_code,
+                                "debt": adeudo, "credit": saldo_favor}
+                else:
+                    raise ValueError(f"Operación no válida: {operation}")
+        except KeyError as error:
+            response = {"ok": False, "error": f"Falta el campo {error.args[0]}"}
+        except (TypeError, ValueError) as error:
+            response = {"ok": False, "error": str(error)}
+        else:
+            response["ok"] = True
+        
+        if "id" in request:
+            response["id"] = request["id"]
+        return response
+    
+    async def _mutate(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Aplica un cambio de pagos con el candado del departamento y espera
+        a que quede guardado (si hay repositorio).
+        """
+        unit_code = str(request["unit_code"])
+        lock = self._locks.setdefault(unit_code, asyncio.Lock())
+        async with lock:
+            contract = self._find_contract(unit_code)
+            if request["op"] == "post_payment":
+                amount = float(request["amount"])
+                if not math.isfinite(amount):
+                    raise ValueError("El monto del pago debe ser un número finito.")
+                if amount <= 0:
+                    raise ValueError("El monto del pago debe ser mayor a 0.")
+                contract.post_payment(amount, request.get("date"))
+            else:
+                paid_months = float(request.get("paid_months") or 0.0)
+                paid_amount = float(request.get("paid_amount") or 0.0)
+                if not (math.isfinite(paid_months) and math.isfinite(paid_amount)):
+                    raise ValueError("Los pagos deben ser números finitos.")
+                if paid_months < 0 or paid_amount < 0:
+                    raise ValueError("Los pagos no pueden ser negativos.")
+                contract.set_payments(paid_months, paid_amount, request.get("date"))
+            
+            if self.repository is not None:
+                self._pending[id(contract)] = contract
+                waiter = asyncio.get_running_loop().create_future()
+                self._waiters.append(waiter)
+                await waiter
+        
+        paid_months, paid_amount = contract.get_payment_info()
+        return {"unit_code": unit_code, "paid_months": paid_months,
+                "paid_amount": paid_amount}
+    
+    def _flush(self):
+        """
+        Escribe en un solo lote los contratos modificados y confirma a los
+        clientes que esperaban ese lote.
+        """
+        if not self._pending:
+            return
+        contracts, self._pending = list(self._pending.values()), {}
+        waiters, self._waiters = self._waiters, []
+        try:
+            self.repository.upsert_contracts(contracts, self.manager.current_year)
+        except sqlite3.Error as error:
+            for waiter in waiters:
+                waiter.set_exception(ValueError(f"No se pudo guardar: {error}"))
+        else:
+            for waiter in waiters:
+                waiter.set_result(None)
+    
+    async def _flush_loop(self):
+        """
+        Escribe periódicamente los cambios pendientes.
+        """
+        while True:
+            await asyncio.sleep(self.batch_interval)
+            self._flush()
+    
+    async def _handle_client(self, reader: asyncio.StreamReader,
+                             writer: asyncio.StreamWriter):
+        """
+        Atiende una conexión: una solicitud JSON por línea, una respuesta
+        JSON por línea. Las solicitudes de una conexión se atienden en orden.
+        """
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("La solicitud debe ser un objeto JSON")
+                except ValueError as error:
+                    response = {"ok": False, "error": f"JSON inválido: {error}"}
+                else:
+                    response = await self.handle_request(request)
+                writer.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+    
+    async def serve(self, host: str, port: int):
+        """
+        Inicia el servicio y atiende conexiones hasta que se cancele.
+        
+        Args:
+            host (str): Dirección donde escuchar
+            port (int): Puerto TCP
+        """
+        if self.repository is not None:
+            self._flusher = asyncio.create_task(self._flush_loop())
+        server = await asyncio.start_server(self._handle_client, host, port)
+        print(f"Servicio de pagos escuchando en {host}:{port} "
+              f"({len(self.manager.contracts)} contratos)")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if self._flusher is not None:
+                self._flusher.cancel()
+            if self.repository is not None:
+                self._flush()
+
+
+def run_payment_service(manager: Any, host: str, port: int,
+                        repository: Optional[ContractRepository] = None):
+    """
+    Ejecuta el servicio de pagos hasta que se interrumpa con Ctrl+C.
+    
+    Args:
+        manager (BuildingManager): Administrador con los contratos cargados
+        host (str): Dirección donde escuchar
+        port (int): Puerto TCP
+        repository (Optional[ContractRepository]): Base donde guardar cambios
+    """
+    service = PaymentService(manager, repository)
+    try:
+        asyncio.run(service.serve(host, port))
+    except KeyboardInterrupt:
+        print("\nServicio detenido.")
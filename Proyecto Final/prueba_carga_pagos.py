@@ -0,0 +1,143 @@
+"""
+Prueba de carga del servicio de pagos
+=====================================
+
+Simula varias cajas conectadas al mismo tiempo al servicio de pagos de
+Avance_Proyecto Final_V2.py (opción --servicio). Cada caja abre su propia
+conexión y envía una mezcla de pagos y consultas de balance; al final se
+reportan solicitudes por segundo y latencias (p50, p99 y máxima).
+
+Uso:
+    python "Avance_Proyecto Final_V2.py" --archivo contratos.csv --anio 2025 --mes 9 --servicio 8765
+    python prueba_carga_pagos.py --archivo contratos.csv --puerto 8765 [--cajas 50] [--solicitudes 200]
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import random
+import time
+from typing import Dict, List
+
+
+def read_unit_codes(path: str, limit: int) -> List[str]:
+    """
+    Lee las claves de departamento de un archivo CSV o JSONL de contratos.
+
+    Args:
+        path (str): Ruta del archivo
+        limit (int): Máximo de claves a leer
+
+    Returns:
+        List[str]: Claves de departamento
+    """
+    units = []
+    with open(path, newline="", encoding="utf-8") as handle:
+        if path.endswith((".jsonl", ".json")):
+            records = (json.loads(line) for line in handle if line.strip())
+        else:
+            records = csv.DictReader(handle)
+        for record in records:
+            units.append(str(record["unit_code"]).strip())
+            if len(units) >= limit:
+                break
+    return units
+
+
+async def run_cashier(host: str, port: int, units: List[str], requests: int,
+                      payment_ratio: float, seed: int) -> Dict[str, object]:
+    """
+    Simula una caja: envía solicitudes una tras otra y mide cada latencia.
+
+    Args:
+        host (str): Dirección del servicio
+        port (int): Puerto del servicio
+        units (List[str]): Departamentos a consultar o pagar
+        requests (int): Solicitudes a enviar
+        payment_ratio (float): Fracción de solicitudes que son pagos
+        seed (int): Semilla de la caja
+
+    Returns:
+        Dict[str, object]: Latencias (segundos) y número de errores
+    """
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    latencies = []
+    errors = 0
+    try:
+        for number in range(requests):
+            unit_code = rng.choice(units)
+            if rng.random() < payment_ratio:
+                request = {"id": number, "op": "post_payment", "unit_code": unit_code,
+                           "amount": rng.choice((500.0, 1000.0, 7500.0))}
+            else:
+                request = {"id": number, "op": "balance", "unit_code": unit_code}
+
+            start = time.perf_counter()
+            writer.write(json.dumps(request).encode("utf-8") + b"\n")
+            await writer.drain()
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - start)
+            if not response.get("ok"):
+                errors += 1
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return {"latencies": latencies, "errors": errors}
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Percentil por rango más cercano de una lista ya ordenada."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+async def run_load_test(args: argparse.Namespace):
+    units = read_unit_codes(args.archivo, args.departamentos)
+    if not units:
+        raise SystemExit(f"Error: {args.archivo} no tiene contratos.")
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        run_cashier(args.host, args.puerto, units, args.solicitudes,
+                    args.pagos, args.semilla + cashier)
+        for cashier in range(args.cajas)
+    ))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for result in results for latency in result["latencies"])
+    errors = sum(result["errors"] for result in results)
+
+    print(f"Prueba de carga: {args.cajas} cajas x {args.solicitudes} solicitudes "
+          f"({args.pagos:.0%} pagos) sobre {len(units)} departamentos")
+    print(f"  Solicitudes: {len(latencies):,} en {elapsed:.2f} s ({errors} con error)")
+    print(f"  Solicitudes por segundo: {len(latencies) / elapsed:,.0f}")
+    print(f"  Latencia p50: {percentile(latencies, 0.50) * 1000:.2f} ms")
+    print(f"  Latencia p99: {percentile(latencies, 0.99) * 1000:.2f} ms")
+    print(f"  Latencia máxima: {latencies[-1] * 1000:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga del servicio de pagos")
+    parser.add_argument("--archivo", required=True,
+                        help="CSV o JSONL con los contratos cargados en el servicio")
+    parser.add_argument("--host", default="127.0.0.1", help="Dirección del servicio")
+    parser.add_argument("--puerto", type=int, required=True, help="Puerto del servicio")
+    parser.add_argument("--cajas", type=int, default=50,
+                        help="Conexiones simultáneas (default: 50)")
+    parser.add_argument("--solicitudes", type=int, default=200,
+                        help="Solicitudes por caja (default: 200)")
+    parser.add_argument("--pagos", type=float, default=0.5,
+                        help="Fracción de solicitudes que son pagos, 0..1 (default: 0.5)")
+    parser.add_argument("--departamentos", type=int, default=1000,
+                        help="Departamentos a usar del archivo (default: 1000)")
+    parser.add_argument("--semilla", type=int, default=2025, help="Semilla (default: 2025)")
+    args = parser.parse_args()
+
+    asyncio.run(run_load_test(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Pruebas de regresión del validador en lote (V1)
+===============================================
+
+Uso:
+    python -m pytest test_avance_v1.py
+    python -m unittest test_avance_v1
+"""
+
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent
+
+
+def load_v1():
+    """
+    Importa Avance_Proyecto Final_V1.py a partir de su archivo (el nombre
+    tiene espacios, por eso no se puede importar con `import`).
+    """
+    module_name = "proyecto_v1"
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name,
+                                                  PROJECT_DIR / "Avance_Proyecto Final_V1.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+v1 = load_v1()
+
+HEADER = "tenant_name,unit_code,start_month,start_year,bedrooms,monthly_rent,paid_months,paid_amount\n"
+
+
+class ValidateFileTest(unittest.TestCase):
+
+    def validate(self, name, content):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, name)
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(content)
+        return v1.validate_file(path)
+
+    def test_ragged_rows_do_not_shift_columns(self):
+        # Una línea con un campo de más y otra con uno de menos suman el
+        # total esperado de campos
+        report = self.validate("contratos.csv", HEADER
+                               + "Ana,D101,1,2025,3,,0,7500,extra\n"
+                               + "Beto,D102,2,2025,4,,0\n")
+        self.assertNotIn(("bedrooms", "Debe estar entre 3 y 4."), report.counts)
+        self.assertEqual(report.rows, 2)
+
+    def test_malformed_json_line_is_reported(self):
+        report = self.validate("contratos.jsonl",
+                               '{"tenant_name": "Ana", "unit_code": "D101", "start_month": 1,'
+                               ' "start_year": 2025, "bedrooms": 3}\n'
+                               '{"tenant_name": "Beto", \n')
+        self.assertEqual(report.rows, 2)
+        self.assertEqual(report.counts, {(v1.RECORD_COLUMN, "No es un objeto JSON válido."): 1})
+        self.assertEqual(report.examples[(v1.RECORD_COLUMN, "No es un objeto JSON válido.")], [2])
+
+    def test_historic_contract_requires_rent(self):
+        report = self.validate("contratos.csv", HEADER
+                               + "Ana,D101,1,2023,3,,0,0\n"
+                               + "Beto,D102,1,2023,3,0,0,0\n"
+                               + "Caro,D103,1,2023,3,6000,0,0\n"
+                               + "Dani,D104,1,2025,3,,0,0\n")
+        self.assertEqual(report.counts, {
+            ("monthly_rent", "Obligatoria en contratos fuera de 2024–2025."): 1,
+            ("monthly_rent", "Debe ser > 0 en contratos fuera de 2024–2025."): 1,
+        })
+        self.assertEqual(report.invalid_rows, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
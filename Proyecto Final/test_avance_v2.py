@@ -0,0 +1,432 @@
+"""
+Pruebas de regresión del proyecto final (V2)
+============================================
+
+Uso:
+    python -m pytest test_avance_v2.py
+    python -m unittest test_avance_v2
+"""
+
+import asyncio
+import importlib.util
+import json
+import os
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent
+
+
+def load_v2():
+    """
+    Importa Avance_Proyecto Final_V2.py a partir de su archivo (el nombre
+    tiene espacios, por eso no se puede importar con `import`).
+    """
+    module_name = "proyecto_v2"
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name,
+                                                  PROJECT_DIR / "Avance_Proyecto Final_V2.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+v2 = load_v2()
+
+
+class BuildingTotalTest(unittest.TestCase):
+
+    def test_total_after_month_change(self):
+        manager = v2.BuildingManager(2025, 5)
+        first = v2.build_contract("Ana", "D101", 1, 2024, 3)
+        first.set_payments(2, 15000.0)
+        manager.add_contract(first)
+        self.assertEqual(manager.calculate_building_total(), 15000.0)
+
+        # Con el mes cambiado la caché ya no se actualiza: el total debe
+        # recalcularse e incluir el contrato y el pago nuevos
+        manager.current_month = 4
+        second = v2.build_contract("Beto", "D102", 1, 2024, 4)
+        second.set_payments(1, 8500.0)
+        manager.add_contract(second)
+        first.post_payment(7500.0)
+        self.assertEqual(manager.calculate_building_total(), 31000.0)
+        self.assertEqual(manager.calculate_statistics().total_collected, 31000.0)
+
+    def test_total_follows_payments(self):
+        manager = v2.BuildingManager(2025, 5)
+        contract = v2.build_contract("Ana", "D101", 1, 2024, 3)
+        manager.add_contract(contract)
+        contract.post_payment(7500.0)
+        contract.post_payment(7500.0)
+        self.assertEqual(manager.calculate_building_total(), 15000.0)
+
+
+class LoadContractsTest(unittest.TestCase):
+
+    def write(self, content):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "contratos.csv")
+        with open(path, "w", encoding="utf-8-sig") as handle:
+            handle.write(content)
+        return path
+
+    def test_file_with_bom(self):
+        path = self.write("tenant_name,unit_code,start_month,start_year,bedrooms,paid_amount\n"
+                          "Ana,D101,1,2025,3,7500\n")
+        manager = v2.BuildingManager(2025, 5)
+        self.assertEqual(manager.load_contracts(path), 1)
+        self.assertEqual(manager.calculate_building_total(), 7500.0)
+
+    def test_invalid_record_exits_with_message(self):
+        path = self.write("tenant_name,unit_code,start_month,start_year,bedrooms,paid_amount\n"
+                          "Ana,D101,1,2025,3,inf\n")
+        args = v2.argparse.Namespace(archivo=path, portafolio=None, db=None, anio=2025,
+                                     mes=5, streaming=False, servicio=None, departamento=None,
+                                     resumenes=False, reporte=None, formato="texto", morosos=None)
+        with self.assertRaises(SystemExit) as raised:
+            v2.run(args)
+        self.assertTrue(str(raised.exception.code).startswith("Error: Registro 1 inválido"))
+
+
+class PaymentLedgerTest(unittest.TestCase):
+
+    def test_loaded_contract_has_no_ledger(self):
+        contract = v2.contract_from_record({
+            "tenant_name": "Ana", "unit_code": "D101", "start_month": "1",
+            "start_year": "2025", "bedrooms": "3", "paid_amount": "15000",
+        })
+        self.assertIsNone(contract._ledger)
+        self.assertEqual(contract.payment_history(), [])
+        self.assertEqual(contract.replay_payments(), (2.0, 15000.0))
+
+    def test_first_payment_keeps_loaded_totals(self):
+        contract = v2.build_contract("Ana", "D101", 1, 2025, 3)
+        contract.restore_payments(2, 15000.0)
+        contract.post_payment(7500.0, "2025-03-01")
+        self.assertEqual(contract.get_payment_info(), (3.0, 22500.0))
+        self.assertEqual(contract.replay_payments("2025-02-28"), (2.0, 15000.0))
+        self.assertEqual(contract.replay_payments(), (3.0, 22500.0))
+
+
+class DelinquencyIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = v2.DelinquencyIndex(6, 2025)
+        self.contracts = [v2.build_contract(f"T{n}", f"D{n}", 1, 2025, 3 + n % 2)
+                          for n in range(50)]
+        for contract in self.contracts:
+            self.index.update(contract)
+
+    def debts(self):
+        # Adeudos esperados calculados contrato por contrato
+        debts = [(contract, contract.balance(6, 2025)[0]) for contract in self.contracts]
+        return sorted((debt for debt in debts if debt[1] > 0), key=lambda debt: -debt[1])
+
+    def pay_randomly(self, payments):
+        generator = random.Random(17)
+        for _ in range(payments):
+            contract = generator.choice(self.contracts)
+            contract.post_payment(generator.choice((2500.0, 7500.0, 8500.0)))
+            self.index.update(contract)
+
+    def test_matches_full_sort_after_updates(self):
+        self.pay_randomly(400)
+        expected = self.debts()
+        self.assertEqual(len(self.index), len(expected))
+        top = self.index.top_debtors(10)
+        self.assertEqual([debt for _, debt in top], [debt for _, debt in expected[:10]])
+        # Consultar no cambia el índice
+        self.assertEqual(self.index.top_debtors(10), top)
+        self.assertEqual(len(self.index.top_debtors(len(expected) + 5)), len(expected))
+
+    def test_owing_more_than(self):
+        self.pay_randomly(200)
+        owing = self.index.owing_more_than(2)
+        expected = {id(contract) for contract, debt in self.debts()
+                    if debt / contract.monthly_rent > 2}
+        self.assertEqual({id(contract) for contract, _ in owing}, expected)
+        months = [months for _, months in owing]
+        self.assertEqual(months, sorted(months, reverse=True))
+        self.assertTrue(all(months_owed > 2 for months_owed in months))
+
+    def test_paid_contract_leaves_index(self):
+        contract = self.contracts[0]
+        contract.set_payments(6, 6 * contract.monthly_rent)
+        self.index.update(contract)
+        self.assertNotIn(contract, [debtor for debtor, _ in self.index.top_debtors(50)])
+        self.assertEqual(len(self.index), 49)
+
+    def test_compact_drops_stale_entries(self):
+        self.pay_randomly(300)
+        top = self.index.top_debtors(5)
+        self.assertGreater(len(self.index._by_debt), len(self.index))
+        self.index._compact()
+        self.assertEqual(len(self.index._by_debt), len(self.index))
+        self.assertEqual(len(self.index._by_months), len(self.index))
+        self.assertEqual(self.index.top_debtors(5), top)
+
+
+class ContractRepositoryTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "contratos.db")
+
+    def test_tenant_change_keeps_both_contracts(self):
+        manager = v2.BuildingManager(2025, 12)
+        first = v2.build_contract("Ana", "D101", 1, 2025, 3)
+        first.set_payments(5, 37500.0)
+        second = v2.build_contract("Beto", "D101", 7, 2025, 3)
+        second.set_payments(6, 45000.0)
+        manager.add_contract(first)
+        manager.add_contract(second)
+        with v2.ContractRepository(self.path) as repository:
+            self.assertEqual(manager.save_to_repository(repository), 2)
+            loaded = v2.BuildingManager(2025, 12)
+            self.assertEqual(loaded.load_from_repository(repository), 2)
+        self.assertEqual(sorted(c.tenant_name for c in loaded.find_by_unit("D101")),
+                         ["Ana", "Beto"])
+        self.assertEqual(loaded.calculate_building_total(), 82500.0)
+
+    def test_repository_matches_file(self):
+        # Un contrato que inicia después del mes actual también se cobra
+        # desde enero al cargar el archivo; la base debe dar lo mismo
+        path = os.path.join(os.path.dirname(self.path), "contratos.csv")
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write("tenant_name,unit_code,start_month,start_year,bedrooms,paid_amount\n"
+                         "Ana,D101,1,2025,3,15000\n"
+                         "Beto,D102,9,2025,4,0\n"
+                         "Caro,D103,12,2024,3,7500\n")
+        from_file = v2.BuildingManager(2025, 5)
+        from_file.load_contracts(path)
+        from_db = v2.BuildingManager(2025, 5)
+        with v2.ContractRepository(self.path) as repository:
+            from_file.save_to_repository(repository)
+            self.assertEqual(from_db.load_from_repository(repository), 3)
+            roster = v2.RepositoryRoster(repository, 2025)
+            self.assertEqual(len(list(roster.refs())), 3)
+        self.assertEqual(from_db.calculate_statistics(), from_file.calculate_statistics())
+
+    def test_repeated_contract_counts_once(self):
+        contract = v2.build_contract("Ana", "D101", 1, 2025, 3)
+        with v2.ContractRepository(self.path) as repository:
+            self.assertEqual(repository.upsert_contracts([contract, contract], 2025), 1)
+
+
+class RentSchedulePersistenceTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.manager = v2.BuildingManager(2025, 6)
+        contract = v2.contract_from_record({
+            "tenant_name": "Ana", "unit_code": "D101", "start_month": "3",
+            "start_year": "2023", "monthly_rent": "6000",
+            "rent_changes": "2024-03:7000;2025-03:7500", "paid_amount": "20000",
+        })
+        self.manager.add_contract(contract)
+        self.expected = contract.balance(6, 2025)
+
+    def assert_same_balance(self, loaded):
+        contract = loaded.find_by_unit("D101")[0]
+        self.assertEqual(contract.rent_changes(), "2024-03:7000.00;2025-03:7500.00")
+        self.assertEqual(contract.balance(6, 2025), self.expected)
+
+    def test_repository_keeps_schedule(self):
+        with v2.ContractRepository(os.path.join(self.directory, "contratos.db")) as repository:
+            self.manager.save_to_repository(repository)
+            loaded = v2.BuildingManager(2025, 6)
+            loaded.load_from_repository(repository)
+        self.assert_same_balance(loaded)
+
+    def test_future_change_keeps_current_debt(self):
+        # Un cambio de renta en 2027 no cambia lo que se debe en 2025
+        fixed = v2.build_contract("Beto", "D102", 7, 2025, 3)
+        scheduled = v2.build_contract("Caro", "D103", 7, 2025, 3)
+        scheduled.add_rent_change(2027, 1, 9000.0)
+        self.assertEqual(fixed.expected_due(9, 2025), 67500.0)
+        self.assertEqual(scheduled.expected_due(9, 2025), 67500.0)
+        self.assertEqual(scheduled.rent_at(9, 2025), 7500.0)
+        self.assertEqual(scheduled.rent_at(1, 2027), 9000.0)
+
+    def test_summary_shows_rent_in_force(self):
+        contract = self.manager.find_by_unit("D101")[0]
+        row = v2.contract_summary_row(contract, 6, 2025)
+        self.assertEqual(row["monthly_rent"], 7500.0)
+        self.assertEqual(v2.contract_summary_row(contract, 2, 2025)["monthly_rent"], 7000.0)
+
+    def test_table_rejects_schedule(self):
+        if v2.np is None:
+            self.skipTest("requiere NumPy")
+        with self.assertRaises(ValueError):
+            v2.ContractTable.from_contracts(self.manager.find_by_unit("D101"))
+
+    def test_snapshot_keeps_schedule(self):
+        path = os.path.join(self.directory, "contratos.snap")
+        self.manager.save_snapshot(path)
+        loaded = v2.BuildingManager(2025, 6)
+        loaded.load_snapshot(path)
+        self.assert_same_balance(loaded)
+        with v2.ContractSnapshot(path) as snapshot:
+            self.assertEqual(list(snapshot.balances(6, 2025)), [self.expected])
+
+
+class RosterTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.path = os.path.join(self.directory, "contratos.csv")
+        with open(self.path, "w", encoding="utf-8-sig") as handle:
+            handle.write("tenant_name,unit_code,start_month,start_year,bedrooms,paid_amount\n")
+            for n in range(20):
+                handle.write(f"T{n},D{n % 8},{1 + n % 12},2025,{3 + n % 2},{n * 2500}\n")
+        self.eager = v2.BuildingManager(2025, 5)
+        self.eager.load_contracts(self.path)
+
+    def summaries(self, manager, unit_code):
+        return sorted((manager.contract_summary_row(contract)
+                       for contract in manager.find_by_unit(unit_code)),
+                      key=lambda row: row["tenant_name"])
+
+    def assert_lazy_matches(self, roster):
+        lazy = v2.BuildingManager(2025, 5)
+        lazy.attach_roster(roster)
+        self.assertEqual(self.summaries(lazy, "D3"), self.summaries(self.eager, "D3"))
+        # Solo se construyeron los contratos de D3
+        self.assertEqual(len(lazy.contracts), 3)
+        self.assertEqual(lazy.find_by_unit("D99"), [])
+        self.assertEqual(lazy.calculate_statistics(), self.eager.calculate_statistics())
+        self.assertEqual(len(lazy.contracts), 20)
+
+    def test_file_roster(self):
+        roster = v2.FileRoster(self.path)
+        self.addCleanup(roster.close)
+        self.assertEqual(len(roster), 20)
+        self.assert_lazy_matches(roster)
+
+    def test_repository_roster(self):
+        with v2.ContractRepository(os.path.join(self.directory, "contratos.db")) as repository:
+            self.eager.save_to_repository(repository)
+            self.assert_lazy_matches(v2.RepositoryRoster(repository, 2025))
+
+
+class PaymentServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.manager = v2.BuildingManager(2025, 3)
+        self.manager.add_contract(v2.build_contract("Ana", "D101", 1, 2025, 3))
+        self.service = v2.PaymentService(self.manager)
+
+    def request(self, **request):
+        return asyncio.run(self.service.handle_request(request))
+
+    def test_queries(self):
+        self.request(op="post_payment", unit_code="D101", amount=7500.0, date="2025-01-05")
+        lookup = self.request(op="lookup", unit_code="D101", id=7)
+        self.assertTrue(lookup["ok"])
+        self.assertEqual((lookup["id"], lookup["paid_amount"], lookup["debt"]), (7, 7500.0, 15000.0))
+        balance = self.request(op="balance", unit_code="D101")
+        self.assertEqual((balance["debt"], balance["credit"]), (15000.0, 0.0))
+        self.assertEqual(self.request(op="stats")["total_collected"], 7500.0)
+
+    def test_bad_requests(self):
+        self.assertEqual(self.request(op="lookup")["error"], "Falta el campo unit_code")
+        self.assertFalse(self.request(op="lookup", unit_code="D999")["ok"])
+        self.assertFalse(self.request(op="borrar", unit_code="D101")["ok"])
+        self.assertFalse(self.request(op="post_payment", unit_code="D101", amount=-5)["ok"])
+
+    def test_concurrent_payments_are_saved_in_batches(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        repository = v2.ContractRepository(os.path.join(directory.name, "contratos.db"))
+        self.addCleanup(repository.close)
+        service = v2.PaymentService(self.manager, repository, batch_interval=0.01)
+
+        async def pay():
+            flusher = asyncio.create_task(service._flush_loop())
+            try:
+                return await asyncio.gather(*(
+                    service.handle_request({"op": "post_payment", "unit_code": "D101",
+                                            "amount": 2500.0})
+                    for _ in range(6)))
+            finally:
+                flusher.cancel()
+
+        responses = asyncio.run(pay())
+        self.assertTrue(all(response["ok"] for response in responses))
+        self.assertEqual(sorted(response["paid_amount"] for response in responses),
+                         [2500.0 * n for n in range(1, 7)])
+        saved = list(repository.iter_contracts(2025))
+        paid_months, paid_amount = saved[0].get_payment_info()
+        self.assertAlmostEqual(paid_months, 2.0)
+        self.assertEqual(paid_amount, 15000.0)
+
+    def test_protocol_answers_bad_lines(self):
+        async def exchange(lines):
+            server = await asyncio.start_server(self.service._handle_client, "127.0.0.1", 0)
+            async with server:
+                port = server.sockets[0].getsockname()[1]
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write(b"".join(line + b"\n" for line in lines))
+                await writer.drain()
+                responses = [json.loads(await reader.readline()) for _ in lines]
+                writer.close()
+                await writer.wait_closed()
+            return responses
+
+        responses = asyncio.run(exchange([b"{", b"[1]",
+                                          b'{"op": "post_payment", "unit_code": "D101", "amount": 1e400}',
+                                          b'{"op": "balance", "unit_code": "D101"}']))
+        self.assertEqual([response["ok"] for response in responses], [False, False, False, True])
+        self.assertEqual(responses[3]["debt"], 22500.0)
+
+    def test_non_finite_amount_is_rejected(self):
+        for amount in ("inf", float("inf"), "nan"):
+            response = self.request(op="post_payment", unit_code="D101", amount=amount)
+            self.assertFalse(response["ok"])
+        response = self.request(op="set_payments", unit_code="D101", paid_amount="inf")
+        self.assertFalse(response["ok"])
+        self.assertEqual(self.manager.find_by_unit("D101")[0].get_payment_info(), (0.0, 0.0))
+
+
+class PortfolioTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        for building, payments in (("norte", (0, 7500, 30000)), ("sur", (15000, 0))):
+            with open(os.path.join(self.directory, f"{building}.csv"), "w", encoding="utf-8") as handle:
+                handle.write("tenant_name,unit_code,start_month,start_year,bedrooms,paid_amount\n")
+                for position, paid_amount in enumerate(payments):
+                    handle.write(f"T{position},D{position},1,2025,3,{paid_amount}\n")
+
+    def expected(self, name):
+        manager = v2.BuildingManager(2025, 3)
+        manager.load_contracts(os.path.join(self.directory, f"{name}.csv"))
+        return manager
+
+    def test_close_month_in_workers(self):
+        portfolio = v2.PortfolioManager(2025, 3)
+        self.assertEqual(portfolio.load_directory(self.directory), 2)
+        per_building = portfolio.close_month(max_workers=2, top_k=2)
+        self.assertEqual(portfolio.buildings, {})
+        self.assertEqual(per_building, {name: self.expected(name).calculate_statistics()
+                                        for name in ("norte", "sur")})
+        debtors = [(name, contract.unit_code, debt) for name, contract, debt in portfolio.top_debtors(2)]
+        self.assertEqual(debtors, [("norte", "D0", 22500.0), ("sur", "D1", 22500.0)])
+
+
+if __name__ == "__main__":
+    unittest.main()